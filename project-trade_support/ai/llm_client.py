@@ -2,8 +2,10 @@
 LLM?????? - ???AI??? (OpenAI / Claude / Gemini) ?????
 """
 
-import json
-import re
+import importlib.util
+import threading
+import time
+from functools import lru_cache
 
 from config.settings import (
     ANTHROPIC_API_KEY,
@@ -11,6 +13,145 @@ from config.settings import (
     OPENAI_API_KEY,
     is_configured,
 )
+from ai.prompt_cache import prompt_cache
+from utils import jsonlib
+
+
+# ── サーキットブレーカー設定 ──
+CIRCUIT_FAILURE_THRESHOLD = 3    # 連続失敗でオープンにする回数
+CIRCUIT_COOLDOWN_SEC = 60        # オープン中にプロバイダをスキップする秒数
+CIRCUIT_MAX_COOLDOWN_SEC = 300   # Retry-After ヒントを採用する上限秒数
+
+# SDK内蔵リトライ回数（429/5xx をジッター付き指数バックオフ + Retry-After で再試行）
+LLM_MAX_RETRIES = 3
+
+
+def _rate_limit_cooldown(error: Exception) -> float | None:
+    """レート制限(429)ならサーバ指定の待機秒数（無ければ既定クールダウン）を返す"""
+    # OpenAI / Anthropic SDK は status_code、google.api_core は code にHTTPステータスを持つ
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status != 429:
+        return None
+    # google.api_core（gRPC）の response は headers を持たないため既定クールダウンにする
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    retry_after = headers.get("retry-after") if headers is not None else None
+    try:
+        return min(float(retry_after), CIRCUIT_MAX_COOLDOWN_SEC)
+    except (TypeError, ValueError):
+        return CIRCUIT_COOLDOWN_SEC
+
+
+# ── 応答からのJSON抽出 ──
+def _fenced_block(text: str) -> str | None:
+    """最初の ```json ... ``` コードフェンスの中身を str.find だけで取り出す（言語名 json は除く）"""
+    start = text.find("```")
+    if start < 0:
+        return None
+    start += 3
+    end = text.find("```", start)
+    if end < 0:
+        return None
+    body = text[start:end]
+    if body.startswith("json"):
+        body = body[4:]
+    return body.strip()
+
+
+def _balanced_json_object(text: str) -> str | None:
+    """最初の '{' から対応する '}' までを1パスで切り出す（文字列リテラル内の括弧は無視）
+
+    貪欲な正規表現 {.*} と違い、閉じ括弧の無い応答でもバックトラックせず O(n) で終わる
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+@lru_cache(maxsize=8)
+def _anthropic_system_blocks(system_prompt: str) -> list[dict]:
+    """キャッシュ指定付きの Anthropic system ブロック（同じ system プロンプトでは同一オブジェクトを返す）
+
+    system は全呼び出しで共通の先頭部分なので cache_control を付けておく
+    （モデルごとの最小トークン数に満たない間はキャッシュされないだけで害はない）
+    """
+    return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+
+# HTTP/2（h2 導入時のみ）: 同時リクエストを1接続に多重化し、TLSハンドシェイクを削減
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+# ── SDKクライアント共有レジストリ ──
+# SDKクライアントはそれぞれHTTP接続プールを持つため、プロセス内で (プロバイダ, APIキー) ごとに1つを共有する
+_CLIENT_REGISTRY: dict[tuple[str, str], object] = {}
+_CLIENT_REGISTRY_LOCK = threading.Lock()
+
+
+def _shared_client(provider: str, api_key: str, factory):
+    """(provider, api_key) に対応するクライアントを返す（初回のみ factory で生成）"""
+    key = (provider, api_key)
+    with _CLIENT_REGISTRY_LOCK:
+        client = _CLIENT_REGISTRY.get(key)
+        if client is None:
+            client = _CLIENT_REGISTRY[key] = factory()
+        return client
+
+
+class CircuitBreaker:
+    """連続して失敗したプロバイダを一定時間スキップする"""
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown_sec: float = CIRCUIT_COOLDOWN_SEC,
+    ):
+        self.threshold = threshold
+        self.cooldown_sec = cooldown_sec
+        self._failures = 0
+        self._open_until = 0.0
+        # ダッシュボードの各セッションと常駐ボットのスレッドから同時に更新される
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """呼び出し可否（クールダウン経過後はハーフオープンとして1回の試行を許可）"""
+        with self._lock:
+            return time.monotonic() >= self._open_until
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+
+    def record_failure(self, cooldown_sec: float | None = None):
+        """失敗を記録（cooldown_sec 指定時はレート制限として即座にその秒数オープン）"""
+        with self._lock:
+            self._failures += 1
+            if cooldown_sec is not None:
+                self._open_until = time.monotonic() + cooldown_sec
+            elif self._failures >= self.threshold:
+                # ハーフオープンでの失敗も即座に再オープンする
+                self._open_until = time.monotonic() + self.cooldown_sec
 
 
 class LLMClient:
@@ -21,12 +162,35 @@ class LLMClient:
         self._anthropic_client = None
         self._google_model = None
 
+        # プロバイダ名 → 呼び出し関数（呼び出しごとのdict再構築を避ける）
+        self._providers = {
+            "openai": self.query_openai,
+            "anthropic": self.query_anthropic,
+            "google": self.query_google,
+        }
+        # APIキーの有効性は事前に疎通確認せず、実リクエストの成否で判定する
+        self._breakers = {name: CircuitBreaker() for name in self._providers}
+
+    def _circuit_allows(self, provider: str) -> bool:
+        if self._breakers[provider].allow():
+            return True
+        print(f"[LLMClient] {provider} は連続エラーのため一時停止中（スキップ）")
+        return False
+
     @property
     def openai_client(self):
         if self._openai_client is None and is_configured("OPENAI_API_KEY"):
             import openai
 
-            self._openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
+            self._openai_client = _shared_client(
+                "openai",
+                OPENAI_API_KEY,
+                lambda: openai.OpenAI(
+                    api_key=OPENAI_API_KEY,
+                    max_retries=LLM_MAX_RETRIES,
+                    http_client=openai.DefaultHttpxClient(http2=HTTP2_ENABLED),
+                ),
+            )
         return self._openai_client
 
     @property
@@ -34,7 +198,15 @@ class LLMClient:
         if self._anthropic_client is None and is_configured("ANTHROPIC_API_KEY"):
             import anthropic
 
-            self._anthropic_client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+            self._anthropic_client = _shared_client(
+                "anthropic",
+                ANTHROPIC_API_KEY,
+                lambda: anthropic.Anthropic(
+                    api_key=ANTHROPIC_API_KEY,
+                    max_retries=LLM_MAX_RETRIES,
+                    http_client=anthropic.DefaultHttpxClient(http2=HTTP2_ENABLED),
+                ),
+            )
         return self._anthropic_client
 
     @property
@@ -42,15 +214,28 @@ class LLMClient:
         if self._google_model is None and is_configured("GOOGLE_API_KEY"):
             import google.generativeai as genai
 
-            genai.configure(api_key=GOOGLE_API_KEY)
-            self._google_model = genai.GenerativeModel("gemini-2.0-flash")
+            def create_model():
+                genai.configure(api_key=GOOGLE_API_KEY)
+                return genai.GenerativeModel("gemini-2.0-flash")
+
+            self._google_model = _shared_client("google", GOOGLE_API_KEY, create_model)
         return self._google_model
 
-    def query_openai(self, prompt: str, system_prompt: str = "", model: str = "gpt-5") -> str:
-        """OpenAI API (GPT?) ??????"""
-        if not self.openai_client:
+    def query_openai(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        model: str = "gpt-5",
+        json_mode: bool = False,
+    ) -> str:
+        """OpenAI API (GPT?) ??????
+
+        json_mode=True ではJSONオブジェクトのみを出力させる（コードフェンス等が付かない）
+        """
+        if not self.openai_client or not self._circuit_allows("openai"):
             return ""
 
+        breaker = self._breakers["openai"]
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -62,11 +247,14 @@ class LLMClient:
             "max_completion_tokens": 4096,
             "temperature": 0.3,
         }
-        if model.startswith("gpt-5"):
-            request_kwargs.pop("temperature", None)
+        if model.startswith("gpt-5"):
+            request_kwargs.pop("temperature", None)
+        if json_mode:
+            request_kwargs["response_format"] = {"type": "json_object"}
 
         try:
             response = self.openai_client.chat.completions.create(**request_kwargs)
+            breaker.record_success()
             return response.choices[0].message.content or ""
         except Exception as e:
             error_text = str(e)
@@ -77,12 +265,15 @@ class LLMClient:
                 request_kwargs.pop("temperature", None)
                 try:
                     response = self.openai_client.chat.completions.create(**request_kwargs)
+                    breaker.record_success()
                     return response.choices[0].message.content or ""
                 except Exception as retry_error:
                     print(f"[LLMClient] OpenAI API???: {retry_error}")
+                    breaker.record_failure(_rate_limit_cooldown(retry_error))
                     return ""
 
             print(f"[LLMClient] OpenAI API???: {e}")
+            breaker.record_failure(_rate_limit_cooldown(e))
             return ""
 
     def query_anthropic(
@@ -90,64 +281,105 @@ class LLMClient:
         prompt: str,
         system_prompt: str = "",
         model: str = "claude-sonnet-4-20250514",
+        json_mode: bool = False,
     ) -> str:
-        """Anthropic API (Claude) ??????"""
-        if not self.anthropic_client:
+        """Anthropic API (Claude) ??????
+
+        Claude にはJSON出力モードが無いため json_mode は使わず、プロンプトの出力形式指示に従わせる
+        """
+        if not self.anthropic_client or not self._circuit_allows("anthropic"):
             return ""
 
-        try:
-            kwargs = {
-                "model": model,
-                "max_tokens": 4096,
-                "messages": [{"role": "user", "content": prompt}],
-            }
-            if system_prompt:
-                kwargs["system"] = system_prompt
+        breaker = self._breakers["anthropic"]
+        kwargs = {
+            "model": model,
+            "max_tokens": 4096,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system_prompt:
+            kwargs["system"] = _anthropic_system_blocks(system_prompt)
 
+        try:
             response = self.anthropic_client.messages.create(**kwargs)
+            breaker.record_success()
             return response.content[0].text if response.content else ""
         except Exception as e:
             print(f"[LLMClient] Anthropic API???: {e}")
+            breaker.record_failure(_rate_limit_cooldown(e))
             return ""
 
-    def query_google(self, prompt: str, system_prompt: str = "") -> str:
-        """Google Gemini API ??????"""
-        if not self.google_model:
+    def query_google(self, prompt: str, system_prompt: str = "", json_mode: bool = False) -> str:
+        """Google Gemini API ??????（json_mode=True でJSONのみを出力させる）"""
+        if not self.google_model or not self._circuit_allows("google"):
             return ""
 
-        try:
-            full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-            response = self.google_model.generate_content(full_prompt)
-            return response.text or ""
+        breaker = self._breakers["google"]
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        generation_config = {"response_mime_type": "application/json"} if json_mode else None
+
+        try:
+            response = self.google_model.generate_content(
+                full_prompt, generation_config=generation_config
+            )
+            breaker.record_success()
+            return response.text or ""
         except Exception as e:
             print(f"[LLMClient] Google API???: {e}")
+            breaker.record_failure(_rate_limit_cooldown(e))
             return ""
 
-    def query(self, prompt: str, system_prompt: str = "", provider: str = "openai") -> str:
+    def query(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        provider: str = "openai",
+        json_mode: bool = False,
+    ) -> str:
         """?????????????????????????"""
-        providers = {
-            "openai": self.query_openai,
-            "anthropic": self.query_anthropic,
-            "google": self.query_google,
-        }
-
-        if provider in providers:
-            result = providers[provider](prompt, system_prompt)
+        primary = self._providers.get(provider)
+        if primary is not None:
+            result = primary(prompt, system_prompt, json_mode=json_mode)
             if result:
                 return result
 
-        for name, func in providers.items():
-            if name != provider:
-                result = func(prompt, system_prompt)
-                if result:
-                    return result
+        # フォールバック先は優先順に1つずつ問い合わせ、前が失敗（空応答）した場合だけ次へ進む
+        # （同時に問い合わせると採用されない応答の分も課金されるため並行化しない）
+        for name, func in self._providers.items():
+            if name == provider:
+                continue
+            result = func(prompt, system_prompt, json_mode=json_mode)
+            if result:
+                return result
 
         return "?????AI??????????API????????????"
 
-    def query_json(self, prompt: str, system_prompt: str = "", provider: str = "openai") -> dict:
-        """JSON????????????"""
-        result = self.query(prompt, system_prompt, provider)
-        return self._parse_json(result)
+    def query_json(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        provider: str = "openai",
+        cache_ttl_sec: float = 0,
+    ) -> dict:
+        """JSON????????????
+
+        cache_ttl_sec > 0 のとき、同じプロンプトへの応答をその秒数だけ再利用する
+        （既定は毎回問い合わせる。定期監視サイクルは毎回新しい判断が必要なため）
+        """
+        def compute() -> dict:
+            # JSON出力モード対応のプロバイダには素のJSONだけを返させる（フェンス除去・再パース不要）
+            return self._parse_json(self.query(prompt, system_prompt, provider, json_mode=True))
+
+        if cache_ttl_sec <= 0:
+            return compute()
+
+        # 同じプロンプトの同時呼び出しは1回のAPI呼び出しにまとめ、結果を全員で共有する
+        # 応答なし・JSONとして解釈できなかった応答はキャッシュせず次回再試行する
+        return prompt_cache.get_or_compute(
+            prompt_cache.make_key(provider, system_prompt, prompt),
+            compute,
+            cache_ttl_sec,
+            cacheable=lambda parsed: bool(parsed) and "raw_response" not in parsed,
+        )
 
     @staticmethod
     def _parse_json(text: str) -> dict:
@@ -156,22 +388,22 @@ class LLMClient:
             return {}
 
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return jsonlib.loads(text)
+        except jsonlib.JSONDecodeError:
             pass
 
-        try:
-            match = re.search(r"```(?:json)?\s*\n?(.*?)\n?```", text, re.DOTALL)
-            if match:
-                return json.loads(match.group(1).strip())
-        except json.JSONDecodeError:
+        try:
+            fenced = _fenced_block(text)
+            if fenced:
+                return jsonlib.loads(fenced)
+        except jsonlib.JSONDecodeError:
             pass
 
         try:
-            match = re.search(r"\{.*\}", text, re.DOTALL)
-            if match:
-                return json.loads(match.group(0))
-        except json.JSONDecodeError:
+            candidate = _balanced_json_object(text)
+            if candidate:
+                return jsonlib.loads(candidate)
+        except jsonlib.JSONDecodeError:
             pass
 
         return {"raw_response": text}
@@ -0,0 +1,101 @@
+"""
+プロンプト応答キャッシュ - 同一プロンプトへのLLM応答を一定時間再利用する
+（Streamlit の再実行などで同じ分析を連続して依頼した場合にAPI呼び出しを省く）
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+
+from cachetools import TLRUCache
+
+
+# ── 応答キャッシュ設定 ──
+PROMPT_CACHE_MAXSIZE = 256       # 保持する応答の最大数
+PROMPT_CACHE_TTL_SEC = 60        # ダッシュボードの対話操作で使う保持秒数（LLMClient.query_json は既定で不使用）
+
+
+def _entry_expires_at(key: bytes, value: tuple, now: float) -> float:
+    """キャッシュ失効時刻 = 登録時に決めた時刻（value[0]）"""
+    return value[0]
+
+
+class PromptCache:
+    """(プロバイダ, システムプロンプト, プロンプト) → 応答dict のTTL付きLRUキャッシュ
+
+    プロンプトはテンプレートに変数を埋め込んだ後の文字列なので、
+    テンプレートと変数の組が同じ場合だけ一致する（完全一致キャッシュ）
+    """
+
+    def __init__(self, maxsize: int = PROMPT_CACHE_MAXSIZE):
+        self._cache = TLRUCache(maxsize=maxsize, ttu=_entry_expires_at, timer=time.time)
+        self._lock = threading.Lock()
+        # 計算中のキー → 結果を待ち合わせる Future（同一プロンプトの同時呼び出しを1回にまとめる）
+        self._inflight: dict[bytes, Future] = {}
+
+    @staticmethod
+    def make_key(*parts: str) -> bytes:
+        """各文字列を区切り付きで連結した BLAKE2b ダイジェスト（長いプロンプトを保持しない）"""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.digest()
+
+    def get(self, key: bytes) -> dict | None:
+        with self._lock:
+            entry = self._cache.get(key)
+        # 呼び出し側で結果を加工しても共有中の値が変わらないよう複製して返す
+        return None if entry is None else copy.deepcopy(entry[1])
+
+    def set(self, key: bytes, value: dict, ttl_sec: float = PROMPT_CACHE_TTL_SEC):
+        entry = (time.time() + ttl_sec, copy.deepcopy(value))
+        with self._lock:
+            self._cache[key] = entry
+
+    def get_or_compute(
+        self,
+        key: bytes,
+        compute: Callable[[], dict],
+        ttl_sec: float = PROMPT_CACHE_TTL_SEC,
+        cacheable: Callable[[dict], bool] = bool,
+    ) -> dict:
+        """キャッシュにあれば返し、無ければ compute() の結果を返す
+
+        同じキーの計算が進行中なら新たに計算せずその結果を待つ。
+        cacheable(結果) が真の場合のみキャッシュに登録する
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                return copy.deepcopy(entry[1])
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._inflight[key] = Future()
+
+        if not is_leader:
+            return copy.deepcopy(future.result())
+
+        try:
+            value = compute()
+            if cacheable(value):
+                self.set(key, value, ttl_sec)
+            future.set_result(copy.deepcopy(value))
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# プロセス内で共有する応答キャッシュ（LLMClient のインスタンスをまたいで再利用）
+prompt_cache = PromptCache()
@@ -2,6 +2,9 @@
 プロンプトテンプレート集 - チャート分析・取引戦略・シナリオ監視
 """
 
+# 各テンプレートは固定部分（指示・出力形式）を先頭に、呼び出しごとに変わるデータを末尾に置く
+# （OpenAI / Anthropic のプロンプトキャッシュは先頭一致部分にのみ効くため）
+
 SYSTEM_PROMPT = """あなたは仮想通貨先物のデイトレード専門のテクニカルアナリストです。
 以下の原則に従って分析を行ってください：
 - 客観的なテクニカル分析に基づいて判断すること
@@ -13,17 +16,6 @@ SYSTEM_PROMPT = """あなたは仮想通貨先物のデイトレード専門の
 
 CHART_ANALYSIS_PROMPT = """以下の仮想通貨先物のテクニカル指標データを分析し、総合的な相場判断を行ってください。
 
-## 銘柄情報
-- シンボル: {symbol}
-- 現在価格: {current_price}
-- 24h変動率: {change_24h}%
-
-## テクニカル指標データ
-{technical_data}
-
-## マルチタイムフレーム分析結果
-{multi_timeframe_data}
-
 ## 出力形式（JSON）
 ```json
 {{
@@ -39,24 +31,21 @@ CHART_ANALYSIS_PROMPT = """以下の仮想通貨先物のテクニカル指標
     ],
     "risk_factors": ["リスク要因リスト"]
 }}
-```"""
-
-
-STRATEGY_PROPOSAL_PROMPT = """以下のチャート分析結果を基に、具体的な取引戦略を提案してください。
+```
 
 ## 銘柄情報
 - シンボル: {symbol}
 - 現在価格: {current_price}
+- 24h変動率: {change_24h}%
 
-## チャート分析結果
-{analysis_result}
+## テクニカル指標データ
+{technical_data}
 
-## リスク管理パラメータ
-- 1トレード最大損失: 資金の{max_loss_pct}%
-- 最小リスクリワード比: 1:{min_rr_ratio}
+## マルチタイムフレーム分析結果
+{multi_timeframe_data}"""
 
-## ローソク足データ（直近20本）
-{candle_data}
+
+STRATEGY_PROPOSAL_PROMPT = """以下のチャート分析結果を基に、具体的な取引戦略を提案してください。
 
 ## 出力形式（JSON）
 ```json
@@ -82,22 +71,24 @@ STRATEGY_PROPOSAL_PROMPT = """以下のチャート分析結果を基に、具
 }}
 ```
 
-※ 取引を見送る場合は direction を "skip" とし、理由を reasoning に記載してください。"""
-
+※ 取引を見送る場合は direction を "skip" とし、理由を reasoning に記載してください。
 
-SCENARIO_CHECK_PROMPT = """以下のポジション情報と最新の市場データを確認し、シナリオが崩壊していないか判断してください。
+## リスク管理パラメータ
+- 1トレード最大損失: 資金の{max_loss_pct}%
+- 最小リスクリワード比: 1:{min_rr_ratio}
 
-## ポジション情報
+## 銘柄情報
 - シンボル: {symbol}
-- 方向: {direction}
-- エントリー価格: {entry_price}
 - 現在価格: {current_price}
-- 利確ライン: TP1={tp1}, TP2={tp2}
-- 損切りライン: {stop_loss}
-- シナリオ崩壊条件: {invalidation_condition}
 
-## 最新テクニカル指標
-{technical_data}
+## チャート分析結果
+{analysis_result}
+
+## ローソク足データ（直近20本）
+{candle_data}"""
+
+
+SCENARIO_CHECK_PROMPT = """以下のポジション情報と最新の市場データを確認し、シナリオが崩壊していないか判断してください。
 
 ## 出力形式（JSON）
 ```json
@@ -112,17 +103,23 @@ SCENARIO_CHECK_PROMPT = """以下のポジション情報と最新の市場デ
     }},
     "alert_level": "info | warning | critical"
 }}
-```"""
+```
 
+## ポジション情報
+- シンボル: {symbol}
+- 方向: {direction}
+- エントリー価格: {entry_price}
+- 現在価格: {current_price}
+- 利確ライン: TP1={tp1}, TP2={tp2}
+- 損切りライン: {stop_loss}
+- シナリオ崩壊条件: {invalidation_condition}
 
-SECOND_OPINION_PROMPT = """以下は別のAIアナリストによるチャート分析と取引提案です。
-独立した視点からこの分析を検証し、同意するか・修正を提案するかを判断してください。
+## 最新テクニカル指標
+{technical_data}"""
 
-## 元の分析（別のAIによる）
-{original_analysis}
 
-## 元の指標データ
-{technical_data}
+SECOND_OPINION_PROMPT = """以下は別のAIアナリストによるチャート分析と取引提案です。
+独立した視点からこの分析を検証し、同意するか・修正を提案するかを判断してください。
 
 ## 出力形式（JSON）
 ```json
@@ -132,11 +129,33 @@ SECOND_OPINION_PROMPT = """以下は別のAIアナリストによるチャート
     "risk_assessment": "元の分析で見落とされているリスクがあれば指摘",
     "modified_proposal": {{}} // 修正提案がある場合のみ。なければ空オブジェクト
 }}
-```"""
+```
+
+## 元の分析（別のAIによる）
+{original_analysis}
+
+## 元の指標データ
+{technical_data}"""
 
 GEMINI_REVIEW_PROMPT = """あなたはAIによる過去の取引提案を評価する監査役です。
 提案時の情報と、その後の実際の値動き（結果）を比較し、提案の妥当性を0〜100点で採点してください。
 
+## 採点基準
+- 100点: 完璧な予測（TP到達、かつ逆行ほとんどなし）
+- 80点: 概ね正解（TP到達だが多少の含み損あり、または十分な利益）
+- 50点: どちらとも言えない（エントリーしなかった、または横ばい）
+- 20点: 期待外れ（すぐに損切りラインにかかった）
+- 0点: 完全な逆行（ロング推奨で暴落など）
+
+## 出力形式（JSON）
+```json
+{{
+    "score": 0〜100の整数,
+    "reason": "採点の理由（日本語、150文字以内）",
+    "correct_action": "本来どうすべきだったか（例: 見送り、逆張り、など）"
+}}
+```
+
 ## 提案の詳細
 - 提案日時: {timestamp}
 - 銘柄: {symbol}
@@ -153,20 +172,4 @@ GEMINI_REVIEW_PROMPT = """あなたはAIによる過去の取引提案を評価
 - TP到達: {hit_tp}
 - SL到達: {hit_sl}
 - 最大利益率: {max_profit_pct}%
-- 最大損失率: {max_loss_pct}%
-
-## 採点基準
-- 100点: 完璧な予測（TP到達、かつ逆行ほとんどなし）
-- 80点: 概ね正解（TP到達だが多少の含み損あり、または十分な利益）
-- 50点: どちらとも言えない（エントリーしなかった、または横ばい）
-- 20点: 期待外れ（すぐに損切りラインにかかった）
-- 0点: 完全な逆行（ロング推奨で暴落など）
-
-## 出力形式（JSON）
-```json
-{{
-    "score": 0〜100の整数,
-    "reason": "採点の理由（日本語、150文字以内）",
-    "correct_action": "本来どうすべきだったか（例: 見送り、逆張り、など）"
-}}
-```"""
+- 最大損失率: {max_loss_pct}%"""
@@ -7,17 +7,48 @@ AI仮想通貨デイトレードアシスタント - エントリポイント
 import subprocess
 import sys
 import os
+from pathlib import Path
+
+
+# ダッシュボードスクリプトの絶対パス（起動ディレクトリに依存しない）
+DASHBOARD_PATH = Path(__file__).resolve().parent / "dashboard" / "app.py"
+
+# ── Streamlit 起動オプション（bootstrap にはCLIフラグ名の "." を "_" にした形で渡す） ──
+STREAMLIT_FLAG_OPTIONS = {
+    "server_port": 8501,
+    "browser_gatherUsageStats": False,
+}
 
 
 def main():
-    """Streamlitダッシュボードを起動"""
-    dashboard_path = os.path.join(os.path.dirname(__file__), "dashboard", "app.py")
-    subprocess.run([
-        sys.executable, "-m", "streamlit", "run",
-        dashboard_path,
-        "--server.port", "8501",
-        "--browser.gatherUsageStats", "false",
-    ])
+    """Streamlitダッシュボードを起動
+
+    同じプロセス内で起動し、2つ目のPythonインタプリタの起動を省く
+    （環境変数 TRADE_USE_SUBPROCESS を設定すると従来どおり別プロセスで起動）
+    """
+    # パス誤りは起動後のStreamlit内ではなく、ここで即座に報告する
+    if not DASHBOARD_PATH.is_file():
+        sys.exit(f"ダッシュボードが見つかりません: {DASHBOARD_PATH}")
+    dashboard_path = str(DASHBOARD_PATH)
+
+    if os.environ.get("TRADE_USE_SUBPROCESS"):
+        args = [
+            sys.executable, "-m", "streamlit", "run",
+            dashboard_path,
+            "--server.port", "8501",
+            "--browser.gatherUsageStats", "false",
+        ]
+        if os.name == "nt":
+            # Windows の exec は新プロセス起動＋親の終了になり Ctrl+C が効かなくなるため子プロセスで起動
+            subprocess.run(args)
+            return
+        # 現在のプロセスを置き換える（待機するだけの親インタプリタを残さない）
+        os.execvp(sys.executable, args)
+
+    from streamlit.web import bootstrap
+
+    bootstrap.load_config_options(flag_options=STREAMLIT_FLAG_OPTIONS)
+    bootstrap.run(dashboard_path, False, [], STREAMLIT_FLAG_OPTIONS)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 設定モジュール - 環境変数からAPIキー・各種設定値を読み込む
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -27,8 +28,9 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "")
 
 
+@lru_cache(maxsize=None)
 def is_configured(key_name: str) -> bool:
-    """指定されたAPIキーが設定されているかチェック"""
+    """指定されたAPIキーが設定されているかチェック（キーは起動時に読み込んだ値で固定のため結果をキャッシュ）"""
     value = globals().get(key_name, "")
     return bool(value) and not value.startswith("your_")
 
@@ -12,6 +12,7 @@ SCREENING_PARAMS = {
     "volume_spike_ratio": 2.0,       # 出来高急変の倍率閾値
     "top_n_symbols": 10,             # 上位N銘柄を選出
     "ev_candidate_n": 10,            # 期待値スクリーニング候補数
+    "ev_max_workers": 8,             # 期待値スクリーニングの同時取得数
 }
 
 # ── リスク管理パラメータ ──
@@ -3,17 +3,15 @@ Streamlit ダッシュボード - AI仮想通貨デイトレードアシスタ
 マルチページ構成: ホーム / 分析＆提案 / 監視モニター / 設定
 """
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import json
 from datetime import datetime
 import sys
 import os
 import time
 import threading
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+from pathlib import Path
 
 # プロジェクトルートをパスに追加
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,16 +20,14 @@ from config.settings import (
     MEXC_API_KEY, OPENAI_API_KEY, ANTHROPIC_API_KEY,
     GOOGLE_API_KEY, DISCORD_WEBHOOK_URL, is_configured,
 )
-from config.trading_params import (
-    SCREENING_PARAMS, RISK_PARAMS, ANALYSIS_PARAMS, TIMEFRAMES, MONITOR_PARAMS,
-)
+from config.trading_params import SCREENING_PARAMS, RISK_PARAMS
 from exchange.mexc_client import MEXCClient
 from ai.llm_client import LLMClient
+from ai.prompt_cache import PROMPT_CACHE_TTL_SEC
 from modules.screener import Screener, ExpectedValueScreener
 from modules.analyzer import Analyzer
 from modules.strategist import Strategist
-from modules.strategist import Strategist
-from modules.monitor import MarketMonitor
+from modules.monitor import MarketMonitor, list_proposal_log_files, read_proposal_logs
 from modules.notifier import Notifier
 from modules.gemini_reviewer import GeminiReviewer
 
@@ -198,6 +194,18 @@ st.markdown("""
         margin: 4px 0;
         border-left: 4px solid rgba(100,100,255,0.5);
     }
+
+    .ev-score-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 8px;
+    }
+
+    .ev-score-note {
+        font-size: 0.8rem;
+        color: rgba(250, 250, 250, 0.6);
+        margin: 2px 0;
+    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -205,22 +213,25 @@ st.markdown("""
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # セッション状態の初期化
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# セッション初期値のファクトリ（未設定のキーだけ生成し、毎リランのコピーを避ける）
+SESSION_DEFAULTS = {
+    "screening_results": lambda: None,
+    "ev_screening_results": lambda: None,
+    "selected_symbol": lambda: None,
+    "analysis_result": lambda: None,
+    "strategy_result": lambda: None,
+    "market_monitor": lambda: None,
+    "notifier": lambda: None,
+    "notification_history": list,
+    "screening_params": SCREENING_PARAMS.copy,
+    "risk_params": RISK_PARAMS.copy,
+}
+
+
 def init_session_state():
-    defaults = {
-        "screening_results": None,
-        "ev_screening_results": None,
-        "selected_symbol": None,
-        "analysis_result": None,
-        "strategy_result": None,
-        "market_monitor": None,
-        "notifier": None,
-        "notification_history": [],
-        "screening_params": SCREENING_PARAMS.copy(),
-        "risk_params": RISK_PARAMS.copy(),
-    }
-    for key, val in defaults.items():
+    for key, factory in SESSION_DEFAULTS.items():
         if key not in st.session_state:
-            st.session_state[key] = val
+            st.session_state[key] = factory()
 
 
 init_session_state()
@@ -237,12 +248,17 @@ PAGE_OPTIONS = [PAGE_HOME, PAGE_ANALYSIS, PAGE_LOGS, PAGE_SETTINGS]
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 class BotService:
     def __init__(self):
+        # apscheduler はボット起動時にだけ読み込む（ダッシュボードの起動を軽くする）
+        from apscheduler.schedulers.background import BackgroundScheduler
+
         self.scheduler = BackgroundScheduler()
         self.monitor = MarketMonitor()
         self.reviewer = GeminiReviewer()
         self._setup_jobs()
         
     def _setup_jobs(self):
+        from apscheduler.triggers.cron import CronTrigger
+
         # 15分ごとの市場監視
         self.scheduler.add_job(
             self.monitor.run_market_cycle,
@@ -270,6 +286,17 @@ class BotService:
             self.scheduler.shutdown(wait=False)
             print("BotService stopped.")
 
+    def pause(self):
+        self.scheduler.pause()
+
+    def resume(self):
+        self.scheduler.resume()
+
+    @property
+    def state(self):
+        # 0=STOPPED, 1=RUNNING, 2=PAUSED（APScheduler 3 の state は単なる属性でロック不要）
+        return self.scheduler.state
+
     @property
     def is_running(self):
         return self.scheduler.running
@@ -299,7 +326,9 @@ def get_screener():
 def get_ev_screener():
     return ExpectedValueScreener(get_mexc_client(), st.session_state.screening_params)
 
+@st.cache_resource
 def get_analyzer():
+    # 指標計算キャッシュをリラン間で共有するため1インスタンスを使い回す
     return Analyzer(get_mexc_client(), get_llm_client())
 
 def get_strategist():
@@ -310,6 +339,7 @@ def get_market_monitor():
         st.session_state.market_monitor = MarketMonitor(get_mexc_client(), get_llm_client(), get_notifier())
     return st.session_state.market_monitor
 
+@st.cache_resource
 def get_gemini_reviewer():
     return GeminiReviewer(get_mexc_client(), get_llm_client())
 
@@ -319,6 +349,12 @@ def get_notifier():
     return st.session_state.notifier
 
 
+@st.fragment(run_every="1s")
+def _render_clock():
+    """現在時刻（フラグメント単位で毎秒再実行し、ページ全体はリランしない）"""
+    st.caption(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # サイドバー ナビゲーション
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -350,8 +386,7 @@ with st.sidebar:
     st.markdown("---")
     
     # 時間表示 (リアルタイム更新用)
-    time_placeholder = st.empty()
-    time_placeholder.caption(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    _render_clock()
     st.caption("⚠️ 投資助言ではありません")
 
     # ボット制御パネル
@@ -361,19 +396,19 @@ with st.sidebar:
     bot_service = get_bot_service()
     
     # 状態確認
-    state = bot_service.scheduler.state
+    state = bot_service.state
     # 0=STOPPED, 1=RUNNING, 2=PAUSED
     
     if state == 1: # RUNNING
         st.success("稼働中 🟢")
         if st.button("一時停止 (Pause)", key="btn_pause_bot"):
-            bot_service.scheduler.pause()
+            bot_service.pause()
             st.rerun()
             
     elif state == 2: # PAUSED
         st.warning("一時停止中 ⏸️")
         if st.button("再開 (Resume)", key="btn_resume_bot"):
-            bot_service.scheduler.resume()
+            bot_service.resume()
             st.rerun()
             
     else: # STOPPED
@@ -410,6 +445,37 @@ def page_home():
         _render_ev_screening()
 
 
+# スクリーニング結果テーブルの表示列名
+IND_COL_NAMES = {
+    "symbol": "シンボル", "price": "価格", "change_pct": "変動率(%)",
+    "total_score": "総合スコア",
+    "change_score": "変動スコア", "volume_score": "出来高スコア",
+    "volatility_score": "ボラスコア", "trend_score": "トレンドスコア",
+}
+EV_COL_NAMES = {
+    "symbol": "シンボル", "price": "価格", "change_pct": "変動率(%)",
+    "total_score": "総合スコア",
+    "liquidity_score": "流動性", "range_score": "値幅",
+    "honesty_score": "素直さ", "futures_score": "先物",
+    "spread_pct": "スプレッド(%)", "atr_pct": "ATR(%)",
+    "wick_ratio": "ヒゲ率", "funding_rate": "FR(%)",
+}
+
+
+def _compact_table(df: pd.DataFrame) -> pd.DataFrame:
+    """表示用テーブルの転送量を減らす（スコア列は float32、シンボルはカテゴリ型）
+
+    価格・変動率などは float32 だと表示桁が崩れるため float64 のまま残す
+    """
+    score_cols = [c for c in df.columns if c.endswith("_score") and df[c].dtype == "float64"]
+    return df.astype({**{c: "float32" for c in score_cols}, "symbol": "category"})
+
+
+def _short_symbol(symbol: str) -> str:
+    """シンボルの基軸通貨部分（"BTC/USDT:USDT" → "BTC"、"/" を含まない場合はそのまま）"""
+    return symbol.partition("/")[0]
+
+
 def _render_indicator_screening():
     """指標基準スクリーニング"""
     col1, col2, col3 = st.columns([2, 1, 1])
@@ -440,18 +506,14 @@ def _render_indicator_screening():
         st.markdown("---")
 
         # サマリーメトリクス
-        c1, c2, c3, c4 = st.columns(4)
-        with c1:
-            st.metric("候補銘柄数", f"{len(results)} 銘柄")
-        with c2:
-            avg_score = results["total_score"].mean()
-            st.metric("平均スコア", f"{avg_score:.1f}")
-        with c3:
-            top_symbol = results.iloc[0]["symbol"]
-            st.metric("トップ銘柄", top_symbol.split("/")[0] if "/" in top_symbol else top_symbol)
-        with c4:
-            max_change = results["change_pct"].abs().max()
-            st.metric("最大変動率", f"{max_change:.1f}%")
+        metrics = (
+            ("候補銘柄数", f"{len(results)} 銘柄"),
+            ("平均スコア", f"{results['total_score'].mean():.1f}"),
+            ("トップ銘柄", _short_symbol(results.iloc[0]["symbol"])),
+            ("最大変動率", f"{results['change_pct'].abs().max():.1f}%"),
+        )
+        for col, (label, value) in zip(st.columns(4), metrics):
+            col.metric(label, value)
 
         st.markdown("---")
 
@@ -461,18 +523,7 @@ def _render_indicator_screening():
                        "change_score", "volume_score", "volatility_score", "trend_score"]
         available = [c for c in display_cols if c in results.columns]
 
-        styled_df = results[available].copy()
-        styled_df.columns = [
-            c.replace("symbol", "シンボル")
-             .replace("price", "価格")
-             .replace("change_pct", "変動率(%)")
-             .replace("total_score", "総合スコア")
-             .replace("change_score", "変動スコア")
-             .replace("volume_score", "出来高スコア")
-             .replace("volatility_score", "ボラスコア")
-             .replace("trend_score", "トレンドスコア")
-            for c in available
-        ]
+        styled_df = _compact_table(results[available]).rename(columns=IND_COL_NAMES)
 
         st.dataframe(
             styled_df,
@@ -545,18 +596,15 @@ def _render_ev_screening():
         st.markdown("---")
 
         # サマリー
-        c1, c2, c3, c4 = st.columns(4)
-        with c1:
-            st.metric("候補銘柄数", f"{len(ev_results)} 銘柄")
-        with c2:
-            avg_score = ev_results["total_score"].mean()
-            st.metric("平均スコア", f"{avg_score:.1f} / 100")
-        with c3:
-            top_sym = ev_results.iloc[0]["symbol"]
-            st.metric("トップ銘柄", top_sym.split("/")[0] if "/" in top_sym else top_sym)
-        with c4:
-            top_score = ev_results.iloc[0]["total_score"]
-            st.metric("最高スコア", f"{top_score:.1f}")
+        top_row = ev_results.iloc[0]
+        metrics = (
+            ("候補銘柄数", f"{len(ev_results)} 銘柄"),
+            ("平均スコア", f"{ev_results['total_score'].mean():.1f} / 100"),
+            ("トップ銘柄", _short_symbol(top_row["symbol"])),
+            ("最高スコア", f"{top_row['total_score']:.1f}"),
+        )
+        for col, (label, value) in zip(st.columns(4), metrics):
+            col.metric(label, value)
 
         st.markdown("---")
 
@@ -569,16 +617,7 @@ def _render_ev_screening():
         ]
         available = [c for c in display_cols if c in ev_results.columns]
 
-        styled_df = ev_results[available].copy()
-        col_names = {
-            "symbol": "シンボル", "price": "価格", "change_pct": "変動率(%)",
-            "total_score": "総合スコア",
-            "liquidity_score": "流動性", "range_score": "値幅",
-            "honesty_score": "素直さ", "futures_score": "先物",
-            "spread_pct": "スプレッド(%)", "atr_pct": "ATR(%)",
-            "wick_ratio": "ヒゲ率", "funding_rate": "FR(%)",
-        }
-        styled_df.columns = [col_names.get(c, c) for c in available]
+        styled_df = _compact_table(ev_results[available]).rename(columns=EV_COL_NAMES)
 
         st.dataframe(
             styled_df,
@@ -588,33 +627,36 @@ def _render_ev_screening():
 
         # 各銘柄のスコア内訳
         st.markdown("### 📊 スコア内訳")
-        for i, (_, row) in enumerate(ev_results.iterrows()):
+        # 行ごとに Series を作る iterrows ではなく、dict のリストとして一度に取り出す
+        for i, row in enumerate(ev_results.to_dict("records")):
             sym = row["symbol"]
-            short_sym = sym.split("/")[0] if "/" in sym else sym
+            short_sym = _short_symbol(sym)
             with st.expander(f"#{i} {short_sym} — 総合 {row['total_score']:.1f}pt"):
-                mc1, mc2, mc3, mc4 = st.columns(4)
-                with mc1:
-                    st.markdown(f"""<div class="ev-score-bar">
-                    <b>💧 流動性</b><br>{row['liquidity_score']:.1f} / 25
-                    </div>""", unsafe_allow_html=True)
-                    st.caption(f"Spread: {row.get('spread_pct', 0):.4f}%")
-                    st.caption(f"板厚: ${row.get('depth_value', 0):,.0f}")
-                with mc2:
-                    st.markdown(f"""<div class="ev-score-bar">
-                    <b>📏 値幅</b><br>{row['range_score']:.1f} / 25
-                    </div>""", unsafe_allow_html=True)
-                    st.caption(f"ATR: {row.get('atr_pct', 0):.3f}%")
-                with mc3:
-                    st.markdown(f"""<div class="ev-score-bar">
-                    <b>🎯 素直さ</b><br>{row['honesty_score']:.1f} / 25
-                    </div>""", unsafe_allow_html=True)
-                    st.caption(f"ヒゲ率: {row.get('wick_ratio', 0):.3f}")
-                with mc4:
-                    st.markdown(f"""<div class="ev-score-bar">
-                    <b>📈 先物</b><br>{row['futures_score']:.1f} / 25
-                    </div>""", unsafe_allow_html=True)
-                    st.caption(f"FR: {row.get('funding_rate', 0):.4f}%")
-                    st.caption(f"OI: ${row.get('oi_value', 0):,.0f}")
+                # 4項目のカードと補足を1つのHTMLにまとめ、1回の st.markdown で描画する
+                # （"$" はMarkdownの数式記法と解釈されないよう文字参照で書く）
+                cards = (
+                    ("💧 流動性", row["liquidity_score"], (
+                        f"Spread: {row.get('spread_pct', 0):.4f}%",
+                        f"板厚: &#36;{row.get('depth_value', 0):,.0f}",
+                    )),
+                    ("📏 値幅", row["range_score"], (
+                        f"ATR: {row.get('atr_pct', 0):.3f}%",
+                    )),
+                    ("🎯 素直さ", row["honesty_score"], (
+                        f"ヒゲ率: {row.get('wick_ratio', 0):.3f}",
+                    )),
+                    ("📈 先物", row["futures_score"], (
+                        f"FR: {row.get('funding_rate', 0):.4f}%",
+                        f"OI: &#36;{row.get('oi_value', 0):,.0f}",
+                    )),
+                )
+                cells = "".join(
+                    f'<div><div class="ev-score-bar"><b>{label}</b><br>{score:.1f} / 25</div>'
+                    + "".join(f'<div class="ev-score-note">{note}</div>' for note in notes)
+                    + "</div>"
+                    for label, score, notes in cards
+                )
+                st.markdown(f'<div class="ev-score-grid">{cells}</div>', unsafe_allow_html=True)
 
         # 銘柄選択
         _render_symbol_selector(ev_results, key_suffix="_ev")
@@ -674,7 +716,8 @@ def page_analysis_and_strategy():
     if run_analysis:
         with st.spinner(f"{symbol} を分析中... (AIに問い合わせています)"):
             analyzer = get_analyzer()
-            result = analyzer.get_ai_analysis(symbol, timeframe)
+            # 対話操作の連打・再実行では直近の同一プロンプトの応答を再利用する
+            result = analyzer.get_ai_analysis(symbol, timeframe, cache_ttl_sec=PROMPT_CACHE_TTL_SEC)
             st.session_state.analysis_result = result
 
     # ─────── チャート ───────
@@ -694,7 +737,9 @@ def page_analysis_and_strategy():
         else:
             with st.spinner("AIが取引戦略を考案中..."):
                 strategist = get_strategist()
-                proposal = strategist.generate_proposal(analysis)
+                proposal = strategist.generate_proposal(
+                    analysis, cache_ttl_sec=PROMPT_CACHE_TTL_SEC
+                )
                 st.session_state.strategy_result = {
                     "main_proposal": proposal,
                     "second_opinion": None,
@@ -706,11 +751,47 @@ def page_analysis_and_strategy():
         _render_strategy(symbol, strategy)
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_chart_data(symbol: str, timeframe: str, limit: int = 200) -> dict:
+    """チャート用のOHLCVとEMA・ボリンジャーバンド
+
+    ウィジェット操作のたびに起きる再実行で取得・指標計算を繰り返さないよう60秒キャッシュする
+    """
+    df = get_analyzer().get_ohlcv_df(symbol, timeframe, limit)
+    if df.empty:
+        return {"df": df}
+
+    # ta の EMAIndicator / BollingerBands と同じ算出式（BBは母標準偏差）を pandas で直接計算
+    close = df["close"]
+    bb_window = close.rolling(20, min_periods=20)
+    bb_middle = bb_window.mean()
+    bb_std = bb_window.std(ddof=0)
+    return {
+        "df": df,
+        "ema": {
+            period: close.ewm(span=period, min_periods=period, adjust=False).mean()
+            for period in (9, 21, 55)
+        },
+        "bb_upper": bb_middle + 2 * bb_std,
+        "bb_lower": bb_middle - 2 * bb_std,
+    }
+
+
+# Plotly 描画オプション（モードバーは使わないため非表示、幅はコンテナに追従）
+PLOTLY_CONFIG = {"displayModeBar": False, "responsive": True, "doubleClick": "reset"}
+# EMA 期間 → ライン色
+EMA_COLORS = {9: "#ffd700", 21: "#00bcd4", 55: "#ff6b6b"}
+
+
 def _render_chart(symbol, timeframe):
     """チャート描画"""
+    # plotly はチャート表示時にだけ読み込む（2回目以降は sys.modules から取得される）
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     st.markdown("### 📊 チャート")
-    analyzer = get_analyzer()
-    df = analyzer.get_ohlcv_df(symbol, timeframe, 200)
+    chart_data = _load_chart_data(symbol, timeframe, 200)
+    df = chart_data["df"]
 
     if not df.empty:
         fig = make_subplots(
@@ -731,21 +812,17 @@ def _render_chart(symbol, timeframe):
         ), row=1, col=1)
 
         # EMA
-        import ta as ta_chart
-        for period in [9, 21, 55]:
-            ema = ta_chart.trend.EMAIndicator(df["close"], window=period).ema_indicator()
+        for period, ema in chart_data["ema"].items():
             if ema is not None and not ema.empty:
-                colors = {9: "#ffd700", 21: "#00bcd4", 55: "#ff6b6b"}
                 fig.add_trace(go.Scatter(
                     x=df.index, y=ema,
                     name=f"EMA {period}",
-                    line=dict(width=1, color=colors.get(period, "#888")),
+                    line=dict(width=1, color=EMA_COLORS.get(period, "#888")),
                 ), row=1, col=1)
 
         # ボリンジャーバンド
-        bb_indicator = ta_chart.volatility.BollingerBands(df["close"], window=20, window_dev=2)
-        bb_upper = bb_indicator.bollinger_hband()
-        bb_lower = bb_indicator.bollinger_lband()
+        bb_upper = chart_data["bb_upper"]
+        bb_lower = chart_data["bb_lower"]
         if bb_upper is not None and not bb_upper.empty:
             fig.add_trace(go.Scatter(
                 x=df.index, y=bb_upper, name="BB Upper",
@@ -758,7 +835,7 @@ def _render_chart(symbol, timeframe):
             ), row=1, col=1)
 
         # 出来高
-        colors = ["#00c853" if c >= o else "#ff1744" for c, o in zip(df["close"], df["open"])]
+        colors = np.where(df["close"].to_numpy() >= df["open"].to_numpy(), "#00c853", "#ff1744")
         fig.add_trace(go.Bar(
             x=df.index, y=df["volume"], name="Volume",
             marker_color=colors, opacity=0.5,
@@ -775,11 +852,32 @@ def _render_chart(symbol, timeframe):
             margin=dict(l=60, r=20, t=40, b=40),
         )
 
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
     else:
+        # 取得失敗はキャッシュに残さず、次の再実行で取り直す
+        _load_chart_data.clear(symbol, timeframe, 200)
         st.warning("チャートデータを取得できませんでした。")
 
 
+# AI分析・取引提案の表示ラベル（描画のたびに dict を作らないようモジュール定数にする）
+JUDGMENT_ICONS = {"bullish": "🟢 強気", "bearish": "🔴 弱気", "neutral": "🟡 中立"}
+CONFIDENCE_ICONS = {"high": "⭐⭐⭐", "medium": "⭐⭐", "low": "⭐"}
+CONFIDENCE_LABELS = {"high": "⭐⭐⭐ 高", "medium": "⭐⭐ 中", "low": "⭐ 低"}
+WEIGHT_ICONS = {"strong": "🔵", "moderate": "🟡", "weak": "⚪"}
+AGREEMENT_ICONS = {
+    "agree": "✅ 同意",
+    "partially_agree": "⚠️ 部分同意",
+    "disagree": "❌ 不同意",
+}
+DECISION_BOX_CLASSES = {
+    "confirmed": "success-box",
+    "partial": "warning-box",
+    "rejected": "danger-box",
+    "skip": "warning-box",
+    "single_check": "info-box",
+}
+
+
 def _render_ai_analysis(result):
     """AI分析結果の表示"""
     st.markdown("---")
@@ -795,8 +893,8 @@ def _render_ai_analysis(result):
         confidence = ai.get("confidence", "N/A")
         summary = ai.get("summary", "")
 
-        judgment_icon = {"bullish": "🟢 強気", "bearish": "🔴 弱気", "neutral": "🟡 中立"}.get(judgment, judgment)
-        conf_icon = {"high": "⭐⭐⭐", "medium": "⭐⭐", "low": "⭐"}.get(confidence, confidence)
+        judgment_icon = JUDGMENT_ICONS.get(judgment, judgment)
+        conf_icon = CONFIDENCE_ICONS.get(confidence, confidence)
 
         c1, c2, c3 = st.columns(3)
         with c1:
@@ -818,9 +916,12 @@ def _render_ai_analysis(result):
         signals = ai.get("signals", [])
         if signals:
             st.markdown("#### 📡 シグナル一覧")
-            for sig in signals:
-                weight_icon = {"strong": "🔵", "moderate": "🟡", "weak": "⚪"}.get(sig.get("weight", ""), "")
-                st.markdown(f"- {weight_icon} **{sig.get('indicator', '')}**: {sig.get('signal', '')}")
+            # 1項目ごとに st.markdown を呼ばず、箇条書き全体を1要素として描画する
+            st.markdown("\n".join(
+                f"- {WEIGHT_ICONS.get(sig.get('weight', ''), '')} "
+                f"**{sig.get('indicator', '')}**: {sig.get('signal', '')}"
+                for sig in signals
+            ))
 
         # キーレベル + リスク要因（横並び）
         kl1, kl2 = st.columns(2)
@@ -828,17 +929,16 @@ def _render_ai_analysis(result):
         if key_levels:
             with kl1:
                 st.markdown("#### 🛡️ サポート / 🚧 レジスタンス")
-                for level in key_levels.get("support", []):
-                    st.markdown(f"- 🟢 `{level}`")
-                for level in key_levels.get("resistance", []):
-                    st.markdown(f"- 🔴 `{level}`")
+                lines = [f"- 🟢 `{level}`" for level in key_levels.get("support", [])]
+                lines += [f"- 🔴 `{level}`" for level in key_levels.get("resistance", [])]
+                if lines:
+                    st.markdown("\n".join(lines))
 
         risk_factors = ai.get("risk_factors", [])
         if risk_factors:
             with kl2:
                 st.markdown("#### ⚠️ リスク要因")
-                for rf in risk_factors:
-                    st.markdown(f"- {rf}")
+                st.markdown("\n".join(f"- {rf}" for rf in risk_factors))
 
     # テクニカル指標の詳細
     with st.expander("📊 テクニカル指標データ（詳細）"):
@@ -857,7 +957,8 @@ def _render_strategy(symbol, strategy):
             with st.spinner("Claudeでセカンドオピニオンを取得中..."):
                 strategist = get_strategist()
                 so = strategist.get_second_opinion(
-                    strategy["main_proposal"], st.session_state.analysis_result
+                    strategy["main_proposal"], st.session_state.analysis_result,
+                    cache_ttl_sec=PROMPT_CACHE_TTL_SEC,
                 )
                 strategy["second_opinion"] = so
                 strategy["final_decision"] = strategist._make_final_decision(
@@ -930,7 +1031,7 @@ def _render_strategy(symbol, strategy):
             st.metric("R:R比", f"1:{rr}")
         with c2:
             conf = proposal.get("confidence", "N/A")
-            conf_icon = {"high": "⭐⭐⭐ 高", "medium": "⭐⭐ 中", "low": "⭐ 低"}.get(conf, conf)
+            conf_icon = CONFIDENCE_LABELS.get(conf, conf)
             st.metric("信頼度", conf_icon)
         with c3:
             st.metric("現在価格", main.get("current_price", "N/A"))
@@ -967,11 +1068,7 @@ def _render_strategy(symbol, strategy):
         st.markdown("#### 🔄 セカンドオピニオン（Claude）")
 
         agreement = so.get("agreement", "N/A")
-        agree_icon = {
-            "agree": "✅ 同意",
-            "partially_agree": "⚠️ 部分同意",
-            "disagree": "❌ 不同意",
-        }.get(agreement, agreement)
+        agree_icon = AGREEMENT_ICONS.get(agreement, agreement)
 
         st.markdown(f"**判定**: {agree_icon}")
         review = so.get("review_comment", "")
@@ -990,13 +1087,7 @@ def _render_strategy(symbol, strategy):
         message = fd.get("message", "")
         status = fd.get("status", "")
 
-        box_class = {
-            "confirmed": "success-box",
-            "partial": "warning-box",
-            "rejected": "danger-box",
-            "skip": "warning-box",
-            "single_check": "info-box",
-        }.get(status, "info-box")
+        box_class = DECISION_BOX_CLASSES.get(status, "info-box")
 
         st.markdown(f"""
         <div class="{box_class}">
@@ -1051,6 +1142,33 @@ def _render_strategy(symbol, strategy):
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # ページ 3: 提案ログ (旧監視モニター)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 提案ログの表示件数（最新タブ / 査読済みタブの抽出元）
+LATEST_LOG_LIMIT = 50
+REVIEW_LOG_LIMIT = 100
+
+
+def _proposal_log_signature(log_dir: Path) -> tuple:
+    """提案ログファイルの (ファイル名, 更新時刻) 一覧（キャッシュキー用）"""
+    signature = []
+    for p in list_proposal_log_files(log_dir):
+        try:
+            signature.append((p.name, p.stat().st_mtime_ns))
+        except OSError:
+            # 査読によるリネームと競合した場合は次のリランで拾う
+            continue
+    return tuple(signature)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _load_proposal_logs(log_dir: str, signature: tuple, limit: int) -> list[dict]:
+    """提案ログの読み込み（タブ切替などのリランではディスクを読み直さない）
+
+    キャッシュキーはログディレクトリとファイルの更新時刻の一覧。
+    ログの追記・査読によるリネームでシグネチャが変わるため、明示的なクリアは不要
+    """
+    return read_proposal_logs(Path(log_dir), limit)
+
+
 def page_proposal_logs():
     st.markdown("""
     <div class="main-header">
@@ -1087,17 +1205,20 @@ def page_proposal_logs():
         "\u2705 \u67fb\u8aad\u6e08\u307f\u30ed\u30b0",
     ])
 
+    # 両タブで同じ読み込み結果を使う（新しい順なので先頭50件が最新ログ）
+    logs = _load_proposal_logs(
+        str(monitor.log_dir), _proposal_log_signature(monitor.log_dir), REVIEW_LOG_LIMIT
+    )
+
     # 最新ログ (limit=50)
     with tab1:
-        logs = monitor.get_latest_logs(50)
-        _render_log_list(logs, reviewed_only=False)
+        _render_log_list(logs[:LATEST_LOG_LIMIT], reviewed_only=False)
 
     # 査読済みログ (Reviewed_*) -> 実装簡易化のため、ここでは「gemini_review」があるものを抽出表示する形でも良いが
     # ファイルベースで分かれているので、gemini_reviewerのロジックに合わせて表示する
     with tab2:
         # 査読済みファイルのみ読み込むロジックをmonitorに追加してもいいが、
         # ここでは単純に全ログから `gemini_review` があるものを抽出して表示する
-        logs = monitor.get_latest_logs(100)
         reviewed_logs = [l for l in logs if l.get("gemini_review")]
         _render_log_list(reviewed_logs, reviewed_only=True)
 
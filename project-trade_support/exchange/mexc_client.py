@@ -1,11 +1,60 @@
 """
 MEXC APIクライアント - ccxt経由でMEXC先物APIに接続
 """
+import threading
+import time
 import ccxt
 import pandas as pd
 import numpy as np
+import requests
 from datetime import datetime, timedelta
+from cachetools import TLRUCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config.settings import MEXC_API_KEY, MEXC_SECRET_KEY
+from utils import jsonlib
+
+
+# ── OHLCVキャッシュ設定 ──
+OHLCV_CACHE_MAXSIZE = 512        # 保持する (symbol, timeframe, limit) の最大数
+OHLCV_CACHE_MAX_TTL_SEC = 60     # 未確定足の鮮度を保つための最大保持秒数
+
+# ── 板・ティッカー等の短期キャッシュ設定（種別ごとのTTL秒） ──
+MARKET_CACHE_MAXSIZE = 1024
+MARKET_CACHE_TTL_SEC = {
+    "tickers": 5,         # 全銘柄ティッカー（スクリーニングで連続参照）
+    "ticker": 1,          # 個別ティッカー / 現在価格
+    "order_book": 1,      # オーダーブック
+    "funding_rate": 30,   # Funding Rate（更新間隔が長い）
+    "contract_tickers": 5,  # 契約API 全銘柄ティッカー（一括取得）
+    "futures_symbols": 900,  # 先物銘柄一覧（マーケット情報は滅多に変わらない）
+    "contract_sizes": 86400,  # 契約サイズ（契約仕様は日中に変わらない）
+}
+
+# ── MEXC 契約API エンドポイント ──
+CONTRACT_API_BASE = "https://contract.mexc.com/api/v1/contract"
+CONTRACT_TICKER_URL = f"{CONTRACT_API_BASE}/ticker"
+CONTRACT_DETAIL_URL = f"{CONTRACT_API_BASE}/detail"
+
+# ── HTTP接続プール設定 ──
+HTTP_POOL_CONNECTIONS = 4        # 保持するホスト別プール数（api.mexc.com / contract.mexc.com 等）
+HTTP_POOL_MAXSIZE = 32           # 1ホストあたりのKeep-Alive接続数（並列取得時の枯渇防止）
+
+
+def _build_http_adapter() -> HTTPAdapter:
+    """接続プールを拡張し、GETの一時的エラー（429/5xx）を自動リトライするアダプタ"""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    return HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
 
 
 class MEXCClient:
@@ -23,10 +72,63 @@ class MEXCClient:
             "enableRateLimit": True,
         })
 
+        # ccxt の内部セッションと直接呼び出し用セッションで同じ設定のアダプタを使う
+        adapter = _build_http_adapter()
+        self._http = requests.Session()
+        for session in (self._http, self.exchange.session):
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+        # OHLCVキャッシュ（次の足の確定時刻 or 最大TTLで失効）
+        self._ohlcv_cache = TLRUCache(
+            maxsize=OHLCV_CACHE_MAXSIZE, ttu=self._ohlcv_expires_at, timer=time.time
+        )
+        self._market_cache = TLRUCache(
+            maxsize=MARKET_CACHE_MAXSIZE, ttu=self._market_expires_at, timer=time.time
+        )
+        self._cache_lock = threading.Lock()
+        # 契約APIの一括取得を並列スレッドから同時に発行しないための排他
+        self._contract_fetch_lock = threading.Lock()
+
+    def _ohlcv_expires_at(self, key: tuple, value, now: float) -> float:
+        """キャッシュ失効時刻 = min(次の足の確定時刻, now + 最大TTL)"""
+        timeframe = key[1]
+        tf_sec = self.exchange.parse_timeframe(timeframe)
+        next_close = now - (now % tf_sec) + tf_sec
+        return min(next_close, now + OHLCV_CACHE_MAX_TTL_SEC)
+
+    @staticmethod
+    def _market_expires_at(key: tuple, value, now: float) -> float:
+        """キャッシュ失効時刻 = now + 種別ごとのTTL（key[0] が種別）"""
+        return now + MARKET_CACHE_TTL_SEC[key[0]]
+
+    def _get_market_cache(self, key: tuple):
+        with self._cache_lock:
+            return self._market_cache.get(key)
+
+    def _set_market_cache(self, key: tuple, value):
+        with self._cache_lock:
+            self._market_cache[key] = value
+
+    def invalidate_ohlcv(self, symbol: str | None = None):
+        """OHLCVキャッシュを破棄（symbol指定時はその銘柄のみ）"""
+        with self._cache_lock:
+            if symbol is None:
+                self._ohlcv_cache.clear()
+                return
+            for key in [k for k in self._ohlcv_cache.keys() if k[0] == symbol]:
+                self._ohlcv_cache.pop(key, None)
+
     def fetch_futures_symbols(self) -> list[dict]:
-        """全先物銘柄のシンボル情報を取得"""
+        """全先物銘柄のシンボル情報を取得（15分間キャッシュ）"""
+        cached = self._get_market_cache(("futures_symbols",))
+        if cached is not None:
+            return list(cached)
+
         try:
-            markets = self.exchange.load_markets()
+            # ccxt は一度読み込んだマーケット情報を使い回すため、
+            # キャッシュ失効時だけ再読み込みして新規上場・上場廃止を反映する
+            markets = self.exchange.load_markets(reload=bool(self.exchange.markets))
             futures = []
             for symbol, market in markets.items():
                 if market.get("swap") and market.get("active"):
@@ -36,21 +138,28 @@ class MEXCClient:
                         "quote": market.get("quote", ""),
                         "info": market,
                     })
-            return futures
+            self._set_market_cache(("futures_symbols",), futures)
+            return list(futures)
         except Exception as e:
             print(f"[MEXCClient] 先物銘柄取得エラー: {e}")
             return []
 
     def fetch_tickers(self) -> dict:
-        """全先物銘柄のティッカー情報を取得"""
+        """全先物銘柄のティッカー情報を取得（数秒間キャッシュ）"""
+        cached = self._get_market_cache(("tickers",))
+        if cached is not None:
+            return dict(cached)
+
         try:
             tickers = self.exchange.fetch_tickers()
-            # swapのみフィルタ
-            swap_tickers = {}
-            for symbol, ticker in tickers.items():
-                if ":USDT" in symbol or symbol.endswith("/USDT"):
-                    swap_tickers[symbol] = ticker
-            return swap_tickers
+            # swapのみフィルタ（USDT建て: "BTC/USDT:USDT" / "BTC/USDT"）
+            swap_tickers = {
+                symbol: ticker
+                for symbol, ticker in tickers.items()
+                if ":USDT" in symbol or symbol.endswith("/USDT")
+            }
+            self._set_market_cache(("tickers",), swap_tickers)
+            return dict(swap_tickers)
         except Exception as e:
             print(f"[MEXCClient] ティッカー取得エラー: {e}")
             return {}
@@ -58,26 +167,67 @@ class MEXCClient:
     def fetch_ohlcv(
         self, symbol: str, timeframe: str = "15m", limit: int = 200
     ) -> pd.DataFrame:
-        """OHLCVデータ（ローソク足）を取得してDataFrameで返す"""
+        """OHLCVデータ（ローソク足）を取得してDataFrameで返す（足確定までキャッシュ）"""
+        key = (symbol, timeframe, limit)
+        with self._cache_lock:
+            cached = self._ohlcv_cache.get(key)
+        if cached is not None:
+            return cached.copy()
+
         try:
             ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
             if not ohlcv:
                 return pd.DataFrame()
 
-            df = pd.DataFrame(
-                ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"]
+            # 列ごとの型付き配列から直接組み立てる（ccxt は時系列昇順で返すためソート不要）
+            columns = self._ohlcv_columns(ohlcv)
+            index = pd.DatetimeIndex(
+                pd.to_datetime(columns.pop("timestamp"), unit="ms"), name="timestamp"
             )
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-            df.set_index("timestamp", inplace=True)
-            return df
+            df = pd.DataFrame(columns, index=index, copy=False)
+
+            with self._cache_lock:
+                self._ohlcv_cache[key] = df
+            return df.copy()
         except Exception as e:
             print(f"[MEXCClient] OHLCV取得エラー ({symbol}, {timeframe}): {e}")
             return pd.DataFrame()
 
+    def fetch_ohlcv_arrays(
+        self, symbol: str, timeframe: str = "1m", limit: int = 200
+    ) -> dict[str, np.ndarray]:
+        """OHLCVを列ごとのNumPy配列で返す（DataFrame化せず集計だけしたい用途向け）
+
+        Returns:
+            {"timestamp": int64(ms), "open"/"high"/"low"/"close"/"volume": float64}
+            取得失敗時は空の dict
+        """
+        try:
+            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            if not ohlcv:
+                return {}
+            return self._ohlcv_columns(ohlcv)
+        except Exception as e:
+            print(f"[MEXCClient] OHLCV取得エラー ({symbol}, {timeframe}): {e}")
+            return {}
+
+    @staticmethod
+    def _ohlcv_columns(ohlcv: list[list]) -> dict[str, np.ndarray]:
+        """ccxt の [[ts, o, h, l, c, v], ...] を1回のキャストで列ごとの配列に分解"""
+        raw = np.asarray(ohlcv, dtype=np.float64)
+        return {
+            "timestamp": raw[:, 0].astype(np.int64),
+            "open": raw[:, 1],
+            "high": raw[:, 2],
+            "low": raw[:, 3],
+            "close": raw[:, 4],
+            "volume": raw[:, 5],
+        }
+
     def fetch_current_price(self, symbol: str) -> float | None:
         """現在価格を取得"""
         try:
-            ticker = self.exchange.fetch_ticker(symbol)
+            ticker = self._fetch_ticker_cached(symbol)
             return ticker.get("last")
         except Exception as e:
             print(f"[MEXCClient] 現在価格取得エラー ({symbol}): {e}")
@@ -86,7 +236,13 @@ class MEXCClient:
     def fetch_order_book(self, symbol: str, limit: int = 20) -> dict:
         """オーダーブックを取得"""
         try:
-            return self.exchange.fetch_order_book(symbol, limit)
+            ob = self._fetch_order_book_cached(symbol, limit)
+            # 共有キャッシュを呼び出し側の変更から守るため、板の各レベルまでコピーして返す
+            return {
+                **ob,
+                "bids": [list(level) for level in ob["bids"]],
+                "asks": [list(level) for level in ob["asks"]],
+            }
         except Exception as e:
             print(f"[MEXCClient] オーダーブック取得エラー ({symbol}): {e}")
             return {"bids": [], "asks": []}
@@ -94,56 +250,167 @@ class MEXCClient:
     def fetch_ticker_detail(self, symbol: str) -> dict:
         """個別銘柄のティッカー詳細を取得"""
         try:
-            return self.exchange.fetch_ticker(symbol)
+            return dict(self._fetch_ticker_cached(symbol))
         except Exception as e:
             print(f"[MEXCClient] ティッカー詳細取得エラー ({symbol}): {e}")
             return {}
 
+    def _fetch_ticker_cached(self, symbol: str) -> dict:
+        """個別ティッカー（共有キャッシュ。呼び出し側で変更しないこと）"""
+        key = ("ticker", symbol)
+        ticker = self._get_market_cache(key)
+        if ticker is None:
+            ticker = self.exchange.fetch_ticker(symbol)
+            self._set_market_cache(key, ticker)
+        return ticker
+
+    def _fetch_order_book_cached(self, symbol: str, limit: int) -> dict:
+        """オーダーブック（共有キャッシュ。呼び出し側で変更しないこと）"""
+        key = ("order_book", symbol, limit)
+        ob = self._get_market_cache(key)
+        if ob is None:
+            ob = self.exchange.fetch_order_book(symbol, limit)
+            self._set_market_cache(key, ob)
+        return ob
+
     def fetch_funding_rate(self, symbol: str) -> dict:
         """資金調達率（Funding Rate）を取得"""
+        key = ("funding_rate", symbol)
+        cached = self._get_market_cache(key)
+        if cached is not None:
+            return dict(cached)
+
         try:
             rates = self.exchange.fetch_funding_rate(symbol)
-            return {
+            result = {
                 "symbol": symbol,
                 "funding_rate": rates.get("fundingRate", 0),
                 "next_funding_time": rates.get("fundingDatetime"),
             }
+            self._set_market_cache(key, result)
+            return dict(result)
         except Exception as e:
             print(f"[MEXCClient] Funding Rate取得エラー ({symbol}): {e}")
             return {"symbol": symbol, "funding_rate": 0}
 
+    def fetch_funding_rates(self, symbols: list[str]) -> dict[str, dict]:
+        """複数銘柄の Funding Rate を契約APIの一括ティッカー1回で取得
+
+        一括取得に含まれない銘柄は fetch_funding_rate で個別に取得する
+        契約APIの一括ティッカーには次回精算時刻（nextSettleTime）が含まれないため、
+        一括取得分の next_funding_time は None になる（必要なら fetch_funding_rate を使う）
+        """
+        contract_tickers = self._fetch_contract_tickers()
+        results = {}
+        for symbol in symbols:
+            td = contract_tickers.get(self._to_contract_symbol(symbol))
+            if td is None:
+                results[symbol] = self.fetch_funding_rate(symbol)
+                continue
+            # 一括ティッカーは5秒キャッシュ済み。精算時刻のない結果で
+            # fetch_funding_rate の個別キャッシュを上書きしないよう、ここでは保存しない
+            results[symbol] = {
+                "symbol": symbol,
+                "funding_rate": float(td.get("fundingRate", 0) or 0),
+                "next_funding_time": None,  # 一括ティッカーに精算時刻がない
+            }
+        return results
+
+    def _fetch_contract_tickers(self) -> dict[str, dict]:
+        """契約API の全銘柄ティッカーを1リクエストで取得（MEXC契約名 → ticker）"""
+        cached = self._get_market_cache(("contract_tickers",))
+        if cached is not None:
+            return cached
+
+        with self._contract_fetch_lock:
+            # 待っている間に他スレッドが取得済みならそれを使う
+            cached = self._get_market_cache(("contract_tickers",))
+            if cached is not None:
+                return cached
+            try:
+                resp = self._http.get(CONTRACT_TICKER_URL, timeout=8)
+                if resp.status_code != 200:
+                    return {}
+                data = jsonlib.loads(resp.content)
+                if not data.get("success") or not data.get("data"):
+                    return {}
+                tickers = {td["symbol"]: td for td in data["data"] if td.get("symbol")}
+                self._set_market_cache(("contract_tickers",), tickers)
+                return tickers
+            except Exception as e:
+                print(f"[MEXCClient] 契約ティッカー一括取得エラー: {e}")
+                return {}
+
+    def _fetch_contract_sizes(self) -> dict[str, float]:
+        """全契約の contractSize を1リクエストで取得（MEXC契約名 → 契約サイズ、1日キャッシュ）"""
+        cached = self._get_market_cache(("contract_sizes",))
+        if cached is not None:
+            return cached
+
+        with self._contract_fetch_lock:
+            cached = self._get_market_cache(("contract_sizes",))
+            if cached is not None:
+                return cached
+            try:
+                resp = self._http.get(CONTRACT_DETAIL_URL, timeout=8)
+                if resp.status_code != 200:
+                    return {}
+                data = jsonlib.loads(resp.content)
+                if not data.get("success") or not data.get("data"):
+                    return {}
+                sizes = {
+                    d["symbol"]: float(d.get("contractSize", 1) or 1)
+                    for d in data["data"] if d.get("symbol")
+                }
+                self._set_market_cache(("contract_sizes",), sizes)
+                return sizes
+            except Exception as e:
+                print(f"[MEXCClient] 契約サイズ一括取得エラー: {e}")
+                return {}
+
+    @staticmethod
+    def _to_contract_symbol(symbol: str) -> str:
+        """ccxt シンボル (例: BTC/USDT:USDT) → MEXC契約名 (例: BTC_USDT)"""
+        return f"{symbol.split('/')[0]}_USDT"
+
     def fetch_open_interest(self, symbol: str) -> dict:
-        """未決済建玉（Open Interest）を取得 — MEXC ticker APIから算出"""
-        import requests
+        """未決済建玉（Open Interest）を取得 — MEXC ticker APIから算出
 
+        ティッカー・契約サイズとも一括取得のキャッシュを参照し、
+        一括取得に含まれない銘柄だけ個別に問い合わせる
+        """
         try:
-            # ccxt シンボル (例: BTC/USDT:USDT) → MEXC契約名 (例: BTC_USDT)
-            base = symbol.split("/")[0]
-            contract_symbol = f"{base}_USDT"
+            contract_symbol = self._to_contract_symbol(symbol)
 
             # ticker API から holdVol（建玉枚数）を取得
-            ticker_url = "https://contract.mexc.com/api/v1/contract/ticker"
-            ticker_resp = requests.get(ticker_url, params={"symbol": contract_symbol}, timeout=8)
+            td = self._fetch_contract_tickers().get(contract_symbol)
+            if td is None:
+                ticker_resp = self._http.get(
+                    CONTRACT_TICKER_URL, params={"symbol": contract_symbol}, timeout=8
+                )
 
-            if ticker_resp.status_code != 200:
-                return {"symbol": symbol, "open_interest": 0, "open_interest_value": 0}
+                if ticker_resp.status_code != 200:
+                    return {"symbol": symbol, "open_interest": 0, "open_interest_value": 0}
 
-            ticker_data = ticker_resp.json()
-            if not ticker_data.get("success") or not ticker_data.get("data"):
-                return {"symbol": symbol, "open_interest": 0, "open_interest_value": 0}
+                ticker_data = jsonlib.loads(ticker_resp.content)
+                if not ticker_data.get("success") or not ticker_data.get("data"):
+                    return {"symbol": symbol, "open_interest": 0, "open_interest_value": 0}
+                td = ticker_data["data"]
 
-            td = ticker_data["data"]
             hold_vol = float(td.get("holdVol", 0) or 0)
             last_price = float(td.get("lastPrice", 0) or 0)
 
-            # contract detail から contractSize を取得してOI金額を算出
-            detail_url = "https://contract.mexc.com/api/v1/contract/detail"
-            detail_resp = requests.get(detail_url, params={"symbol": contract_symbol}, timeout=8)
-            contract_size = 1.0
-            if detail_resp.status_code == 200:
-                detail_data = detail_resp.json()
-                if detail_data.get("success") and detail_data.get("data"):
-                    contract_size = float(detail_data["data"].get("contractSize", 1) or 1)
+            # contract detail の contractSize でOI金額を算出
+            contract_size = self._fetch_contract_sizes().get(contract_symbol)
+            if contract_size is None:
+                contract_size = 1.0
+                detail_resp = self._http.get(
+                    CONTRACT_DETAIL_URL, params={"symbol": contract_symbol}, timeout=8
+                )
+                if detail_resp.status_code == 200:
+                    detail_data = jsonlib.loads(detail_resp.content)
+                    if detail_data.get("success") and detail_data.get("data"):
+                        contract_size = float(detail_data["data"].get("contractSize", 1) or 1)
 
             oi_value = hold_vol * contract_size * last_price
 
@@ -161,7 +428,7 @@ class MEXCClient:
         オーダーブックの深さ・スプレッドを計算して返す
         """
         try:
-            ob = self.exchange.fetch_order_book(symbol, limit)
+            ob = self._fetch_order_book_cached(symbol, limit)
             bids = ob.get("bids", [])
             asks = ob.get("asks", [])
 
@@ -174,13 +441,17 @@ class MEXCClient:
             mid_price = (best_ask + best_bid) / 2
             spread_pct = (spread / mid_price * 100) if mid_price > 0 else 0
 
+            # (価格, 数量) の2列に揃えて配列化し、合計は NumPy で一括計算する
+            bid_arr = np.asarray(bids, dtype=np.float64)[:, :2]
+            ask_arr = np.asarray(asks, dtype=np.float64)[:, :2]
+
             # 板の厚み（数量合計）
-            depth_bid = sum(b[1] for b in bids)
-            depth_ask = sum(a[1] for a in asks)
+            depth_bid = float(bid_arr[:, 1].sum())
+            depth_ask = float(ask_arr[:, 1].sum())
 
             # 板の厚み（金額換算）
-            depth_bid_value = sum(b[0] * b[1] for b in bids)
-            depth_ask_value = sum(a[0] * a[1] for a in asks)
+            depth_bid_value = float(bid_arr.prod(axis=1).sum())
+            depth_ask_value = float(ask_arr.prod(axis=1).sum())
 
             return {
                 "symbol": symbol,
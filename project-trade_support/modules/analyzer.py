@@ -1,14 +1,24 @@
 """
 チャート分析モジュール - テクニカル指標からAI総合判断を取得
-ta ライブラリを使用（Python 3.14対応）
+テクニカル指標は modules.indicators（NumPy実装）を使用
 """
+import copy
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-import ta as ta_lib
+from cachetools import LRUCache
 from exchange.mexc_client import MEXCClient
+from modules import indicators as ind
 from ai.llm_client import LLMClient
 from ai.prompts import SYSTEM_PROMPT, CHART_ANALYSIS_PROMPT
 from config.trading_params import ANALYSIS_PARAMS, TIMEFRAMES
+from utils import jsonlib
+
+
+# 指標計算結果キャッシュの最大件数（銘柄 × 時間足）
+INDICATOR_CACHE_MAXSIZE = 256
 
 
 class Analyzer:
@@ -24,6 +34,10 @@ class Analyzer:
         self.llm = llm_client or LLMClient()
         self.params = params or ANALYSIS_PARAMS.copy()
 
+        # (銘柄, 時間足, ローソク足の状態) → 指標計算結果
+        self._indicator_cache = LRUCache(maxsize=INDICATOR_CACHE_MAXSIZE)
+        self._cache_lock = threading.Lock()
+
     def calculate_indicators(self, df: pd.DataFrame) -> dict:
         """DataFrameからテクニカル指標を計算"""
         if df.empty or len(df) < 30:
@@ -31,12 +45,16 @@ class Analyzer:
 
         indicators = {}
         p = self.params
+        high = df["high"].to_numpy(dtype=np.float64)
+        low = df["low"].to_numpy(dtype=np.float64)
+        close = df["close"].to_numpy(dtype=np.float64)
+        volume = df["volume"].to_numpy(dtype=np.float64)
+        current_price = float(close[-1])
 
         try:
             # RSI
-            rsi_series = ta_lib.momentum.RSIIndicator(df["close"], window=p["rsi_period"]).rsi()
-            if rsi_series is not None and not rsi_series.empty:
-                rsi_val = float(rsi_series.iloc[-1])
+            rsi_val = ind.rsi(close, p["rsi_period"])
+            if math.isfinite(rsi_val):
                 indicators["rsi"] = {
                     "value": round(rsi_val, 2),
                     "status": "oversold" if rsi_val < p["rsi_oversold"]
@@ -44,55 +62,36 @@ class Analyzer:
                              else "neutral",
                 }
 
-            # EMA
-            ema_values = {}
-            ema_series_map = {}
-            for period in p["ema_periods"]:
-                ema_series = ta_lib.trend.EMAIndicator(df["close"], window=period).ema_indicator()
-                if ema_series is not None and not ema_series.empty:
-                    ema_values[f"ema_{period}"] = round(float(ema_series.iloc[-1]), 6)
-                    ema_series_map[period] = ema_series
-            indicators["ema"] = ema_values
-
-            # ゴールデン/デッドクロス検出
-            if 9 in ema_series_map and 21 in ema_series_map:
-                ema9 = ema_series_map[9]
-                ema21 = ema_series_map[21]
-                if len(ema9) >= 2 and len(ema21) >= 2:
-                    cross_up = ema9.iloc[-2] < ema21.iloc[-2] and ema9.iloc[-1] > ema21.iloc[-1]
-                    cross_down = ema9.iloc[-2] > ema21.iloc[-2] and ema9.iloc[-1] < ema21.iloc[-1]
-                    indicators["ema_cross"] = (
-                        "golden_cross" if cross_up
-                        else "dead_cross" if cross_down
-                        else "none"
-                    )
-
-            # MACD
-            macd_indicator = ta_lib.trend.MACD(
-                df["close"],
-                window_fast=p["macd_fast"],
-                window_slow=p["macd_slow"],
-                window_sign=p["macd_signal"],
+            # EMA（最新値のみ必要なので系列を作らず内積で算出）
+            ema_last = {period: ind.ema(close, period) for period in p["ema_periods"]}
+            indicators["ema"] = {
+                f"ema_{period}": round(value, 6) for period, value in ema_last.items()
+            }
+
+            # ゴールデン/デッドクロス検出（1本前のEMAは末尾を除いた配列から算出）
+            if 9 in ema_last and 21 in ema_last:
+                ema9, ema21 = ema_last[9], ema_last[21]
+                ema9_prev, ema21_prev = ind.ema(close[:-1], 9), ind.ema(close[:-1], 21)
+                cross_up = ema9_prev < ema21_prev and ema9 > ema21
+                cross_down = ema9_prev > ema21_prev and ema9 < ema21
+                indicators["ema_cross"] = (
+                    "golden_cross" if cross_up
+                    else "dead_cross" if cross_down
+                    else "none"
+                )
+
+            # MACD（MACD線・シグナル線・ヒストグラムを1回の計算で取得）
+            macd_val, signal_val, hist_val = ind.macd(
+                close, p["macd_fast"], p["macd_slow"], p["macd_signal"]
             )
-            macd_line = macd_indicator.macd()
-            signal_line = macd_indicator.macd_signal()
-            hist_line = macd_indicator.macd_diff()
-            if macd_line is not None and not macd_line.empty:
-                indicators["macd"] = {
-                    "macd": round(float(macd_line.iloc[-1]), 6),
-                    "signal": round(float(signal_line.iloc[-1]), 6) if signal_line is not None else None,
-                    "histogram": round(float(hist_line.iloc[-1]), 6) if hist_line is not None else None,
-                }
+            indicators["macd"] = {
+                "macd": round(macd_val, 6),
+                "signal": round(signal_val, 6),
+                "histogram": round(hist_val, 6),
+            }
 
             # ボリンジャーバンド
-            bb = ta_lib.volatility.BollingerBands(
-                df["close"], window=p["bb_period"], window_dev=p["bb_std"]
-            )
-            upper = float(bb.bollinger_hband().iloc[-1])
-            middle = float(bb.bollinger_mavg().iloc[-1])
-            lower = float(bb.bollinger_lband().iloc[-1])
-            width = float(bb.bollinger_wband().iloc[-1])
-            current_price = float(df["close"].iloc[-1])
+            upper, middle, lower, width = ind.bollinger(close, p["bb_period"], p["bb_std"])
 
             indicators["bollinger"] = {
                 "upper": round(upper, 6),
@@ -107,8 +106,8 @@ class Analyzer:
             }
 
             # 出来高分析
-            vol_avg = df["volume"].rolling(p["volume_avg_period"]).mean().iloc[-1]
-            vol_current = df["volume"].iloc[-1]
+            vol_avg = ind.tail_mean(volume, p["volume_avg_period"])
+            vol_current = float(volume[-1])
             indicators["volume"] = {
                 "current": round(float(vol_current), 2),
                 "average": round(float(vol_avg), 2),
@@ -117,18 +116,14 @@ class Analyzer:
             }
 
             # ATR
-            atr = ta_lib.volatility.AverageTrueRange(
-                df["high"], df["low"], df["close"], window=p["atr_period"]
-            ).average_true_range()
-            if atr is not None and not atr.empty:
-                indicators["atr"] = round(float(atr.iloc[-1]), 6)
+            atr = ind.atr(high, low, close, p["atr_period"])
+            if math.isfinite(atr):
+                indicators["atr"] = round(atr, 6)
 
             # ADX
-            adx = ta_lib.trend.ADXIndicator(
-                df["high"], df["low"], df["close"], window=14
-            ).adx()
-            if adx is not None and not adx.empty:
-                indicators["adx"] = round(float(adx.iloc[-1]), 2)
+            adx = ind.adx(high, low, close, 14)
+            if math.isfinite(adx):
+                indicators["adx"] = round(adx, 2)
 
             # フィボナッチリトレースメント
             high_val = float(df["high"].max())
@@ -142,57 +137,86 @@ class Analyzer:
             indicators["fibonacci"]["low"] = round(low_val, 6)
 
             # 現在価格
-            indicators["current_price"] = round(float(df["close"].iloc[-1]), 6)
+            indicators["current_price"] = round(current_price, 6)
 
         except Exception as e:
             indicators["error"] = str(e)
 
         return indicators
 
+    def _indicators_for(self, symbol: str, timeframe: str, df: pd.DataFrame) -> dict:
+        """指標計算（足が増えるか最新足が更新された時だけ再計算し、それ以外は前回結果を再利用）"""
+        # 窓の両端と最新足の値で同一データかを判定（新しい足で窓がスライドすればキーが変わる）
+        key = (
+            symbol,
+            timeframe,
+            len(df),
+            df.index[0],
+            df.index[-1],
+            *(float(df[col].iat[-1]) for col in ("open", "high", "low", "close", "volume")),
+        )
+        with self._cache_lock:
+            cached = self._indicator_cache.get(key)
+        if cached is None:
+            cached = self.calculate_indicators(df)
+            if "error" not in cached:
+                with self._cache_lock:
+                    self._indicator_cache[key] = cached
+        return copy.deepcopy(cached)
+
     def analyze_multi_timeframe(self, symbol: str) -> dict:
         """マルチタイムフレーム分析"""
-        results = {}
         all_timeframes = TIMEFRAMES["upper"] + TIMEFRAMES["lower"]
 
-        for tf in all_timeframes:
-            df = self.client.fetch_ohlcv(symbol, tf, limit=200)
-            if not df.empty:
-                indicators = self.calculate_indicators(df)
-                results[tf] = indicators
-            else:
-                results[tf] = {"error": f"{tf}のデータ取得失敗"}
+        # 時間足ごとに取得→指標計算までを1ワーカーで行い、先に届いた足から計算を始める
+        # （所要時間 ≒ 最も遅い1本の取得 + 計算）
+        with ThreadPoolExecutor(max_workers=len(all_timeframes)) as pool:
+            analyses = pool.map(
+                lambda tf: self._analyze_timeframe(symbol, tf), all_timeframes
+            )
+            return dict(zip(all_timeframes, analyses))
 
-        return results
+    def _analyze_timeframe(self, symbol: str, timeframe: str) -> dict:
+        """1つの時間足のOHLCV取得 + 指標計算"""
+        df = self.client.fetch_ohlcv(symbol, timeframe, limit=200)
+        if df.empty:
+            return {"error": f"{timeframe}のデータ取得失敗"}
+        return self._indicators_for(symbol, timeframe, df)
 
-    def get_ai_analysis(self, symbol: str, timeframe: str = "15m") -> dict:
-        """AIによる総合分析を取得"""
+    def get_ai_analysis(
+        self, symbol: str, timeframe: str = "15m", cache_ttl_sec: float = 0
+    ) -> dict:
+        """AIによる総合分析を取得（cache_ttl_sec > 0 で同一プロンプトの応答を再利用）"""
         # OHLCV取得
         df = self.client.fetch_ohlcv(symbol, timeframe, limit=200)
         if df.empty:
             return {"error": "OHLCVデータ取得失敗"}
 
-        # テクニカル指標計算
-        indicators = self.calculate_indicators(df)
-
         # マルチタイムフレーム分析
         mtf = self.analyze_multi_timeframe(symbol)
 
+        # テクニカル指標計算（分析足がMTFに含まれていればその結果を再利用）
+        indicators = (
+            mtf[timeframe] if timeframe in mtf else self._indicators_for(symbol, timeframe, df)
+        )
+
         # ティッカー情報
         ticker = self.client.fetch_ticker_detail(symbol)
         current_price = ticker.get("last", indicators.get("current_price", "N/A"))
         change_24h = ticker.get("percentage", 0)
 
         # AIにプロンプト送信
-        import json
         prompt = CHART_ANALYSIS_PROMPT.format(
             symbol=symbol,
             current_price=current_price,
             change_24h=round(change_24h, 2) if change_24h else 0,
-            technical_data=json.dumps(indicators, indent=2, ensure_ascii=False, default=str),
-            multi_timeframe_data=json.dumps(mtf, indent=2, ensure_ascii=False, default=str),
+            technical_data=jsonlib.dumps_compact(indicators),
+            multi_timeframe_data=jsonlib.dumps_compact(mtf),
         )
 
-        ai_result = self.llm.query_json(prompt, SYSTEM_PROMPT, provider="openai")
+        ai_result = self.llm.query_json(
+            prompt, SYSTEM_PROMPT, provider="openai", cache_ttl_sec=cache_ttl_sec
+        )
 
         return {
             "symbol": symbol,
@@ -12,6 +12,7 @@ from exchange.mexc_client import MEXCClient
 from ai.llm_client import LLMClient
 from ai.prompts import SYSTEM_PROMPT, GEMINI_REVIEW_PROMPT
 from config.settings import PROJECT_ROOT, is_configured
+from utils import jsonlib
 
 class GeminiReviewer:
     """過去ログの査読を行うクラス"""
@@ -59,8 +60,7 @@ class GeminiReviewer:
     def _process_file(self, filepath: Path):
         """1つのログファイルを処理"""
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                proposals = json.load(f)
+            proposals = jsonlib.loads(filepath.read_bytes())
         except Exception as e:
             print(f"{filepath} 読み込みエラー: {e}")
             return
@@ -136,24 +136,24 @@ class GeminiReviewer:
             # MEXC APIでローソク足取得 (limit指定のみなので、多めに取ってフィルタする)
             # 1分足を使用
             limit = min(1000, elapsed_min + 60) # 余裕を持つ
-            df = self.client.fetch_ohlcv(symbol, "1m", limit=limit)
+            ohlcv = self.client.fetch_ohlcv_arrays(symbol, "1m", limit=limit)
             
-            if df.empty:
+            if not ohlcv:
                 return None
                 
             # start_dt 以降のデータを抽出
-            # df.index は datetime
-            mask = df.index >= start_dt
-            df_slice = df[mask]
+            # timestamp はUTCエポック(ms)。start_dt はローカル時刻なので timestamp() でエポックに揃える
+            start_ms = int(start_dt.timestamp() * 1000)
+            mask = ohlcv["timestamp"] >= start_ms
             
-            if df_slice.empty:
+            if not mask.any():
                 return None
                 
             return {
-                "highest": float(df_slice["high"].max()),
-                "lowest": float(df_slice["low"].min()),
-                "close": float(df_slice["close"].iloc[-1]),
-                "start_price": float(df_slice["open"].iloc[0]),
+                "highest": float(ohlcv["high"][mask].max()),
+                "lowest": float(ohlcv["low"][mask].min()),
+                "close": float(ohlcv["close"][mask][-1]),
+                "start_price": float(ohlcv["open"][mask][0]),
             }
             
         except Exception as e:
@@ -0,0 +1,175 @@
+"""
+テクニカル指標計算モジュール - NumPy 実装（ta ライブラリと同一の算出式）
+ta は指標ごとに pandas Series を作り iloc ループで平滑化するため、
+最新値だけが必要な用途向けに配列上で直接計算する
+"""
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=64)
+def _ewm_weights(n: int, alpha: float) -> np.ndarray:
+    """長さ n の指数平滑（adjust=False）の最終値を内積1回で求める重みベクトル
+
+    s_t = (1-α)^t x_0 + Σ α(1-α)^(t-i) x_i  （足数・期間ごとに同じ重みを再利用）
+    """
+    weights = alpha * (1 - alpha) ** np.arange(n - 1, -1, -1)
+    weights[0] = (1 - alpha) ** (n - 1)
+    weights.flags.writeable = False
+    return weights
+
+
+def _ewm_last(values: np.ndarray, alpha: float) -> float:
+    """pandas ewm(alpha, adjust=False).mean() の最終値（先頭値を初期値とする指数平滑）"""
+    return float(values @ _ewm_weights(len(values), alpha))
+
+
+def ema(close: np.ndarray, period: int) -> float:
+    """EMA の最新値（ta.trend.EMAIndicator: span=period, adjust=False）"""
+    if len(close) < period:
+        return np.nan
+    return _ewm_last(close, 2 / (period + 1))
+
+
+def _ewm_matrix(n: int, alpha: float) -> np.ndarray:
+    """各時点の指数平滑値を行とする重み行列（row j が x[0..j] に掛かる重み）"""
+    lag = np.arange(n)[:, None] - np.arange(n)[None, :]
+    matrix = np.where(lag >= 0, alpha * (1 - alpha) ** np.clip(lag, 0, None), 0.0)
+    matrix[:, 0] = (1 - alpha) ** np.arange(n)
+    return matrix
+
+
+@lru_cache(maxsize=32)
+def _macd_weights(n: int, fast: int, slow: int, signal: int) -> tuple[np.ndarray, np.ndarray]:
+    """MACD線・シグナル線の最新値を終値との内積1回ずつで求める重みベクトル
+
+    MACD線もシグナル線（MACD線のEMA）も終値の線形結合なので、重みを合成しておける
+    """
+    line = _ewm_matrix(n, 2 / (fast + 1)) - _ewm_matrix(n, 2 / (slow + 1))
+    start = slow - 1  # MACD線が有効になる最初の足（ta の min_periods と同じ）
+    macd_weights = line[-1].copy()
+    signal_weights = _ewm_weights(n - start, 2 / (signal + 1)) @ line[start:]
+    macd_weights.flags.writeable = False
+    signal_weights.flags.writeable = False
+    return macd_weights, signal_weights
+
+
+def macd(
+    close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9
+) -> tuple[float, float, float]:
+    """MACD の最新値 (macd, signal, histogram)（ta.trend.MACD と同じ算出式）"""
+    n = len(close)
+    if n < slow:
+        return np.nan, np.nan, np.nan
+    if n < slow + signal - 1:
+        return ema(close, fast) - ema(close, slow), np.nan, np.nan
+
+    macd_weights, signal_weights = _macd_weights(n, fast, slow, signal)
+    macd_val = float(close @ macd_weights)
+    signal_val = float(close @ signal_weights)
+    return macd_val, signal_val, macd_val - signal_val
+
+
+def tail_mean(values: np.ndarray, window: int) -> float:
+    """直近 window 本の平均（rolling(window).mean() の最新値。本数不足なら NaN）"""
+    if len(values) < window:
+        return np.nan
+    return float(values[-window:].mean())
+
+
+def bollinger(
+    close: np.ndarray, window: int = 20, window_dev: float = 2.0
+) -> tuple[float, float, float, float]:
+    """ボリンジャーバンドの最新値 (upper, middle, lower, width)
+
+    ta.volatility.BollingerBands と同じく母標準偏差（ddof=0）、width は中心線比の%
+    """
+    if len(close) < window:
+        return np.nan, np.nan, np.nan, np.nan
+
+    tail = close[-window:]
+    middle = float(tail.mean())
+    band = window_dev * float(tail.std())
+    upper = middle + band
+    lower = middle - band
+    return upper, middle, lower, (upper - lower) / middle * 100
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True Range（先頭は前日終値が無いため 高値-安値）"""
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    # fmax は NaN を無視するので先頭は high - low になる
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def rsi(close: np.ndarray, window: int = 14) -> float:
+    """RSI の最新値（ta.momentum.RSIIndicator と同じ Wilder 平滑）"""
+    if len(close) < window:
+        return np.nan
+
+    diff = np.diff(close, prepend=close[0])
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+
+    avg_up = _ewm_last(up, 1 / window)
+    avg_down = _ewm_last(down, 1 / window)
+    if avg_down == 0:
+        return 100.0
+    return 100 - 100 / (1 + avg_up / avg_down)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> float:
+    """ATR の最新値（ta.volatility.AverageTrueRange と同じ Wilder 平滑）"""
+    if len(close) < window:
+        return np.nan
+
+    tr = true_range(high, low, close)
+    value = float(tr[:window].mean())
+    for t in tr[window:].tolist():
+        value = (value * (window - 1) + t) / window
+    return value
+
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> float:
+    """ADX の最新値（ta.trend.ADXIndicator と同じ算出順序・同じ1本遅れ）"""
+    n = len(close)
+    if n < 2 * window:
+        return np.nan
+
+    # 2本目以降（前日値が存在する足）の方向性移動
+    prev_close = close[:-1]
+    tr = np.maximum(high[1:], prev_close) - np.minimum(low[1:], prev_close)
+    up = high[1:] - high[:-1]
+    down = low[:-1] - low[1:]
+    pos = np.where((up > down) & (up > 0), up, 0.0)
+    neg = np.where((down > up) & (down > 0), down, 0.0)
+
+    # Wilder 累積平滑（ta 同様、最終足の平滑値は ADX に使われない）
+    m = n - window  # 平滑値の個数（ta の配列長 - 1）
+    trs = np.empty(m)
+    dip = np.empty(m)
+    din = np.empty(m)
+    trs[0] = tr[:window].sum()
+    dip[0] = pos[:window].sum()
+    din[0] = neg[:window].sum()
+    decay = 1 - 1 / window
+    tr_l, pos_l, neg_l = tr.tolist(), pos.tolist(), neg.tolist()
+    for i in range(1, m):
+        j = window + i - 1
+        trs[i] = trs[i - 1] * decay + tr_l[j]
+        dip[i] = dip[i - 1] * decay + pos_l[j]
+        din[i] = din[i - 1] * decay + neg_l[j]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        di_pos = np.where(trs != 0, 100 * dip / trs, 0.0)
+        di_neg = np.where(trs != 0, 100 * din / trs, 0.0)
+        di_sum = di_pos + di_neg
+        dx = np.where(di_sum != 0, 100 * np.abs(di_pos - di_neg) / di_sum, 0.0)
+
+    value = float(dx[:window].mean())
+    for d in dx[window:].tolist():
+        value = (value * (window - 1) + d) / window
+    return value
@@ -14,6 +14,7 @@ from modules.analyzer import Analyzer
 from modules.strategist import Strategist
 from modules.notifier import Notifier
 from config.settings import PROJECT_ROOT
+from utils import jsonlib
 
 
 class MarketMonitor:
@@ -232,8 +233,7 @@ class MarketMonitor:
         current_data = []
         if filepath.exists():
             try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    current_data = json.load(f)
+                current_data = jsonlib.loads(filepath.read_bytes())
             except Exception as e:
                 print(f"ログ読み込みエラー: {e}")
 
@@ -249,26 +249,32 @@ class MarketMonitor:
             
     def get_latest_logs(self, limit: int = 50) -> list[dict]:
         """各種ログファイルからデータを読み込んで結合し、時系列逆順で返す"""
-        # ファイル一覧を取得 (新しい順)
-        # Reviewed_proposals_*.json と proposals_*.json の両方を取得する
-        # globは複数パターン指定できないため、2回実行
-        files_reviewed = list(self.log_dir.glob("Reviewed_proposals_*.json"))
-        files_new = list(self.log_dir.glob("proposals_*.json"))
-        
-        # 文字列比較でソートできるよう、Reviewed_を取り除いたファイル名等で管理するか、単純に更新日時でソート
-        all_files = sorted(files_reviewed + files_new, key=lambda x: x.name.replace("Reviewed_", ""), reverse=True)
+        return read_proposal_logs(self.log_dir, limit)
 
-        all_proposals = []
-        for p in all_files:
-            if len(all_proposals) >= limit:
-                break
-            try:
-                with open(p, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # dataはリスト。逆順にして新しいものを先頭に
-                    all_proposals.extend(reversed(data))
-            except:
-                continue
-                
-        return all_proposals[:limit]
+
+def list_proposal_log_files(log_dir: Path) -> list[Path]:
+    """提案ログファイルの一覧を新しい順で返す"""
+    # Reviewed_proposals_*.json と proposals_*.json の両方を取得する
+    # globは複数パターン指定できないため、2回実行
+    files_reviewed = list(log_dir.glob("Reviewed_proposals_*.json"))
+    files_new = list(log_dir.glob("proposals_*.json"))
+
+    # 文字列比較でソートできるよう、Reviewed_を取り除いたファイル名でソート
+    return sorted(files_reviewed + files_new, key=lambda x: x.name.replace("Reviewed_", ""), reverse=True)
+
+
+def read_proposal_logs(log_dir: Path, limit: int = 50) -> list[dict]:
+    """ログディレクトリの提案ログを読み込んで結合し、時系列逆順で返す"""
+    all_proposals = []
+    for p in list_proposal_log_files(log_dir):
+        if len(all_proposals) >= limit:
+            break
+        try:
+            data = jsonlib.loads(p.read_bytes())
+            # dataはリスト。逆順にして新しいものを先頭に
+            all_proposals.extend(reversed(data))
+        except:
+            continue
+
+    return all_proposals[:limit]
 
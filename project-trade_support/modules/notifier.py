@@ -7,6 +7,14 @@ from datetime import datetime
 from config.settings import DISCORD_WEBHOOK_URL, is_configured
 
 
+# Discord Embed カラー（通知レベル別）
+LEVEL_COLORS = {
+    "info": 0x3498DB,      # 青
+    "warning": 0xF39C12,   # オレンジ
+    "critical": 0xE74C3C,  # 赤
+}
+DEFAULT_COLOR = 0x95A5A6   # グレー
+
 class Notifier:
     """Discord Webhook通知クラス"""
 
@@ -44,19 +52,12 @@ class Notifier:
             self.history.append(notification)
             return False
 
-        # Discord Embed カラー
-        colors = {
-            "info": 0x3498DB,      # 青
-            "warning": 0xF39C12,   # オレンジ
-            "critical": 0xE74C3C,  # 赤
-        }
-
         # Discord Webhook送信
         payload = {
             "embeds": [{
                 "title": title,
                 "description": message,
-                "color": colors.get(level, 0x95A5A6),
+                "color": LEVEL_COLORS.get(level, DEFAULT_COLOR),
                 "timestamp": datetime.utcnow().isoformat(),
                 "footer": {"text": "AI Trading Assistant"},
             }]
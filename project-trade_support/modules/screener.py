@@ -1,14 +1,73 @@
 """
 銘柄スクリーニングモジュール - MEXC先物から商機ある銘柄を自動抽出
-ta ライブラリを使用（Python 3.14対応）
+テクニカル指標は modules.indicators（NumPy実装）を使用
 """
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
-import ta as ta_lib
 from exchange.mexc_client import MEXCClient
+from modules import indicators as ind
 from config.trading_params import SCREENING_PARAMS
 
 
+# ccxt ティッカーのキー → スクリーニング用カラム名
+_TICKER_COLUMNS = {
+    "last": "last",
+    "percentage": "change_pct",
+    "quoteVolume": "volume_quote",
+    "high": "high",
+    "low": "low",
+}
+
+# トレンド方向スコア: |24h変動率| が 2% 以下 / 2-5% / 5% 超
+TREND_BINS = np.array([2.0, 5.0])
+TREND_SCORES = np.array([5, 15, 20])
+
+
+def _tickers_to_frame(tickers: dict) -> pd.DataFrame:
+    """ティッカーdictを数値カラムのDataFrameへ一括変換（欠損・非数値は0扱い）"""
+    df = pd.DataFrame.from_records(
+        list(tickers.values()), columns=list(_TICKER_COLUMNS)
+    ).rename(columns=_TICKER_COLUMNS)
+    df = df.apply(pd.to_numeric, errors="coerce").fillna(0)
+    df.insert(0, "symbol", list(tickers.keys()))
+    return df
+
+
+def _avg_range_pct(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 20) -> float:
+    """平均レンジ（High-Low / Close の直近 window 本平均、%）"""
+    return float(((high[-window:] - low[-window:]) / close[-window:] * 100).mean())
+
+
+def _honesty_metrics(
+    open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray
+) -> tuple[float, float, float]:
+    """素直さスコアの元指標 (出来高CV, ヒゲ率, 急変比率) を配列上で一括算出
+
+    DataFrame の列演算を介さず、pandas 版と同じ定義（std は ddof=1、
+    レンジ0の足はヒゲ率から除外、前足比の変動率）で計算する
+    """
+    # 出来高の継続性（直近30本の変動係数）
+    vol_tail = volume[-30:]
+    vol_mean = float(vol_tail.mean())
+    vol_cv = float(vol_tail.std(ddof=1)) / vol_mean if vol_mean > 0 else 999.0
+
+    # ヒゲ率 = ヒゲ合計 / (ヒゲ+実体) の直近40本平均
+    o, h, l, c = open_[-40:], high[-40:], low[-40:], close[-40:]
+    total_wick = (h - np.maximum(o, c)) + (np.minimum(o, c) - l)
+    candle_range = h - l
+    valid = candle_range != 0
+    wick_ratio = float((total_wick[valid] / candle_range[valid]).mean()) if valid.any() else np.nan
+
+    # 急変頻度（前足比で3%以上変動した足の割合）
+    n = len(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spike_count = int((np.abs(close[1:] / close[:-1] - 1) > 0.03).sum())
+    spike_ratio = spike_count / n if n > 0 else 0
+    return vol_cv, wick_ratio, spike_ratio
+
+
 class Screener:
     """銘柄スクリーニングを実行するクラス"""
 
@@ -26,20 +85,7 @@ class Screener:
             return pd.DataFrame()
 
         # 2. ティッカーデータをDataFrame化
-        rows = []
-        for symbol, t in tickers.items():
-            rows.append({
-                "symbol": symbol,
-                "last": t.get("last", 0),
-                "change_pct": t.get("percentage", 0) or 0,
-                "volume_quote": t.get("quoteVolume", 0) or 0,
-                "high": t.get("high", 0) or 0,
-                "low": t.get("low", 0) or 0,
-            })
-
-        df = pd.DataFrame(rows)
-        if df.empty:
-            return df
+        df = _tickers_to_frame(tickers)
 
         # last が 0 の銘柄を除外
         df = df[df["last"] > 0].copy()
@@ -62,64 +108,53 @@ class Screener:
         if df.empty:
             return df
 
-        # 4. スコアリング
-        scored_rows = []
-        for _, row in df.iterrows():
-            score_data = self._calculate_score(row)
-            scored_rows.append(score_data)
-
-        result = pd.DataFrame(scored_rows)
-        if result.empty:
-            return result
+        # 4. スコアリング（全銘柄を列単位で一括計算）
+        result = self._calculate_scores(df)
 
         # 5. スコアでソート、上位N銘柄
         top_n = self.params.get("top_n_symbols", 10)
-        result = result.sort_values("total_score", ascending=False).head(top_n)
+        result = result.nlargest(top_n, "total_score")  # 全件ソートせず上位Nのみ選択
         result = result.reset_index(drop=True)
         result.index = result.index + 1  # 1始まりのランキング
 
         return result
 
-    def _calculate_score(self, row: pd.Series) -> dict:
-        """各銘柄のスコアを計算"""
+    @staticmethod
+    def _calculate_scores(df: pd.DataFrame) -> pd.DataFrame:
+        """全銘柄のスコアを列単位で計算（last > 0 でフィルタ済みの DataFrame を受け取る）"""
+        last = df["last"].to_numpy(dtype=np.float64)
+        change_pct = df["change_pct"].to_numpy(dtype=np.float64)
+        abs_change = df["abs_change"].to_numpy(dtype=np.float64)
+        volume_quote = df["volume_quote"].to_numpy(dtype=np.float64)
+
         # 変動率スコア（0-30）
-        change_score = min(row["abs_change"] / 10.0 * 30, 30)
+        change_score = np.minimum(abs_change / 10.0 * 30, 30)
 
         # 出来高スコア（0-30）
-        vol_score = min(row["volume_quote"] / 1e8 * 30, 30)
+        vol_score = np.minimum(volume_quote / 1e8 * 30, 30)
 
         # ボラティリティスコア - 高値-安値 / 終値（0-20）
-        if row["last"] > 0:
-            hl_range = (row["high"] - row["low"]) / row["last"] * 100
-            vol_score_hl = min(hl_range / 10 * 20, 20)
-        else:
-            vol_score_hl = 0
-
-        # トレンド方向スコア（0-20）
-        if row["change_pct"] > 5:
-            trend_score = 20
-        elif row["change_pct"] > 2:
-            trend_score = 15
-        elif row["change_pct"] < -5:
-            trend_score = 20
-        elif row["change_pct"] < -2:
-            trend_score = 15
-        else:
-            trend_score = 5
+        high = df["high"].to_numpy(dtype=np.float64)
+        low = df["low"].to_numpy(dtype=np.float64)
+        hl_range = (high - low) / last * 100
+        vol_score_hl = np.minimum(hl_range / 10 * 20, 20)
+
+        # トレンド方向スコア（0-20）: 上昇・下落とも変動幅で同じ点数
+        trend_score = TREND_SCORES[np.searchsorted(TREND_BINS, abs_change, side="left")]
 
         total_score = change_score + vol_score + vol_score_hl + trend_score
 
-        return {
-            "symbol": row["symbol"],
-            "price": row["last"],
-            "change_pct": round(row["change_pct"], 2),
-            "volume_quote": round(row["volume_quote"], 0),
-            "change_score": round(change_score, 1),
-            "volume_score": round(vol_score, 1),
-            "volatility_score": round(vol_score_hl, 1),
-            "trend_score": round(trend_score, 1),
-            "total_score": round(total_score, 1),
-        }
+        return pd.DataFrame({
+            "symbol": df["symbol"].to_numpy(),
+            "price": last,
+            "change_pct": change_pct.round(2),
+            "volume_quote": volume_quote.round(0),
+            "change_score": change_score.round(1),
+            "volume_score": vol_score.round(1),
+            "volatility_score": vol_score_hl.round(1),
+            "trend_score": trend_score,
+            "total_score": total_score.round(1),
+        })
 
     def get_detailed_analysis(self, symbol: str, timeframe: str = "15m") -> dict:
         """指定銘柄のOHLCVからATR / ADX等の詳細指標を計算"""
@@ -130,21 +165,22 @@ class Screener:
         result = {"symbol": symbol, "timeframe": timeframe}
 
         try:
+            high = df["high"].to_numpy(dtype=np.float64)
+            low = df["low"].to_numpy(dtype=np.float64)
+            close = df["close"].to_numpy(dtype=np.float64)
+
             # ATR
-            atr = ta_lib.volatility.AverageTrueRange(
-                df["high"], df["low"], df["close"], window=14
-            ).average_true_range()
-            result["atr"] = round(float(atr.iloc[-1]), 6) if atr is not None and not atr.empty else None
+            atr = ind.atr(high, low, close, 14)
+            result["atr"] = round(atr, 6) if math.isfinite(atr) else None
 
             # ADX
-            adx = ta_lib.trend.ADXIndicator(
-                df["high"], df["low"], df["close"], window=14
-            ).adx()
-            result["adx"] = round(float(adx.iloc[-1]), 2) if adx is not None and not adx.empty else None
+            adx = ind.adx(high, low, close, 14)
+            result["adx"] = round(adx, 2) if math.isfinite(adx) else None
 
             # 出来高変化率
-            vol_avg = df["volume"].rolling(60).mean().iloc[-1]
-            vol_recent = df["volume"].iloc[-5:].mean()
+            volume = df["volume"].to_numpy(dtype=np.float64)
+            vol_avg = ind.tail_mean(volume, 60)
+            vol_recent = float(volume[-5:].mean())
             result["volume_spike_ratio"] = round(vol_recent / vol_avg, 2) if vol_avg > 0 else 0
 
         except Exception as e:
@@ -177,57 +213,60 @@ class ExpectedValueScreener:
         if not tickers:
             return pd.DataFrame()
 
-        # ティッカーをDataFrame化して出来高降順ソート
-        ticker_rows = []
-        for symbol, t in tickers.items():
-            vol = t.get("quoteVolume", 0) or 0
-            last = t.get("last", 0) or 0
-            if last > 0 and vol > 0:
-                ticker_rows.append({
-                    "symbol": symbol,
-                    "last": last,
-                    "volume_quote": vol,
-                    "high": t.get("high", 0) or 0,
-                    "low": t.get("low", 0) or 0,
-                    "change_pct": t.get("percentage", 0) or 0,
-                })
-
-        if not ticker_rows:
+        # ティッカーをDataFrame化（価格・出来高が0の銘柄を除外）
+        df = _tickers_to_frame(tickers)
+        df = df[(df["last"] > 0) & (df["volume_quote"] > 0)]
+        if df.empty:
             return pd.DataFrame()
 
-        df = pd.DataFrame(ticker_rows)
-
         # 出来高上位N銘柄を候補にする（API負荷軽減）
         candidate_n = self.params.get("ev_candidate_n", 10)
-        df = df.sort_values("volume_quote", ascending=False).head(candidate_n)
-
-        # 2. 各銘柄の4次元スコアを計算
-        scored_rows = []
-        total = len(df)
+        df = df.nlargest(candidate_n, "volume_quote")
 
-        for idx, (_, row) in enumerate(df.iterrows()):
-            symbol = row["symbol"]
-            if progress_callback:
-                progress_callback(idx + 1, total, symbol)
-
-            try:
-                score = self._evaluate_symbol(symbol, row)
-                scored_rows.append(score)
-            except Exception as e:
-                print(f"[EVScreener] {symbol} スコア計算エラー: {e}")
-                continue
+        # Funding Rate は候補全銘柄分を1リクエストでまとめて取得
+        funding_rates = self.client.fetch_funding_rates(df["symbol"].tolist())
 
+        # 2. 各銘柄の4次元スコアを計算
+        # 板・OHLCV・OI の取得は銘柄ごとに独立した I/O 待ちなので並列に実行し、
+        # 進捗は完了した順に呼び出し元スレッドから通知する
+        rows = [row for _, row in df.iterrows()]
+        results: list[dict | None] = [None] * len(rows)
+        total = len(rows)
+        max_workers = max(1, min(self.params.get("ev_max_workers", 8), total))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(
+                    self._evaluate_symbol, row["symbol"], row, funding_rates.get(row["symbol"])
+                ): idx
+                for idx, row in enumerate(rows)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                idx = futures[future]
+                symbol = rows[idx]["symbol"]
+                if progress_callback:
+                    progress_callback(done, total, symbol)
+
+                try:
+                    results[idx] = future.result()
+                except Exception as e:
+                    print(f"[EVScreener] {symbol} スコア計算エラー: {e}")
+
+        # 同点時の並びが変わらないよう候補順（出来高順）のまま集計する
+        scored_rows = [score for score in results if score is not None]
         if not scored_rows:
             return pd.DataFrame()
 
         result = pd.DataFrame(scored_rows)
         top_n = self.params.get("top_n_symbols", 10)
-        result = result.sort_values("total_score", ascending=False).head(top_n)
+        result = result.nlargest(top_n, "total_score")  # 全件ソートせず上位Nのみ選択
         result = result.reset_index(drop=True)
         result.index = result.index + 1
         return result
 
-    def _evaluate_symbol(self, symbol: str, ticker_row: pd.Series) -> dict:
+    def _evaluate_symbol(
+        self, symbol: str, ticker_row: pd.Series, funding_rate: dict | None = None
+    ) -> dict:
         """1銘柄の4次元スコアを算出"""
         # OHLCVデータ取得（15分足、200本）
         df = self.client.fetch_ohlcv(symbol, "15m", limit=200)
@@ -245,7 +284,7 @@ class ExpectedValueScreener:
         honest_score, honest_detail = self._calc_honesty_score(df) if ohlcv_ok else (0, {})
 
         # --- 4. 先物スコア (0-25) ---
-        futures_score, futures_detail = self._calc_futures_score(symbol)
+        futures_score, futures_detail = self._calc_futures_score(symbol, funding_rate)
 
         total_score = liquidity_score + range_score + honest_score + futures_score
 
@@ -338,10 +377,13 @@ class ExpectedValueScreener:
             price = float(close.iloc[-1])
 
             # ATR（14期間）→ パーセンテージ化
-            atr = ta_lib.volatility.AverageTrueRange(
-                df["high"], df["low"], df["close"], window=14
-            ).average_true_range()
-            atr_val = float(atr.iloc[-1]) if atr is not None and not atr.empty else 0
+            atr_val = ind.atr(
+                df["high"].to_numpy(dtype=np.float64),
+                df["low"].to_numpy(dtype=np.float64),
+                close.to_numpy(dtype=np.float64),
+                14,
+            )
+            atr_val = 0 if not math.isfinite(atr_val) else atr_val
             atr_pct = (atr_val / price * 100) if price > 0 else 0
             detail["atr_pct"] = round(atr_pct, 3)
 
@@ -359,8 +401,12 @@ class ExpectedValueScreener:
             score += atr_pts
 
             # 平均レンジ（High-Low / Close の直近20本平均）
-            hl_range_pct = ((df["high"] - df["low"]) / df["close"] * 100).tail(20).mean()
-            detail["avg_range_pct"] = round(float(hl_range_pct), 3)
+            hl_range_pct = _avg_range_pct(
+                df["high"].to_numpy(dtype=np.float64),
+                df["low"].to_numpy(dtype=np.float64),
+                close.to_numpy(dtype=np.float64),
+            )
+            detail["avg_range_pct"] = round(hl_range_pct, 3)
 
             if 0.5 <= hl_range_pct <= 2.5:
                 range_pts = 12
@@ -386,11 +432,11 @@ class ExpectedValueScreener:
         detail = {}
 
         try:
-            n = len(df)
+            vol_cv, wick_ratio, spike_ratio = _honesty_metrics(
+                *(df[col].to_numpy(dtype=np.float64) for col in ("open", "high", "low", "close", "volume"))
+            )
 
             # 出来高の継続性（直近30本で出来高が安定しているか）
-            vol_tail = df["volume"].tail(30)
-            vol_cv = float(vol_tail.std() / vol_tail.mean()) if vol_tail.mean() > 0 else 999
             detail["volume_cv"] = round(vol_cv, 3)
 
             # CV（変動係数）が低いほど安定
@@ -404,17 +450,8 @@ class ExpectedValueScreener:
                 vol_cont_pts = 1
             score += vol_cont_pts
 
-            # ヒゲ率（ヒゲの長さ / 実体 の平均）→ 小さいほど素直
-            body = (df["close"] - df["open"]).abs()
-            upper_wick = df["high"] - df[["open", "close"]].max(axis=1)
-            lower_wick = df[["open", "close"]].min(axis=1) - df["low"]
-            total_wick = upper_wick + lower_wick
-            candle_range = df["high"] - df["low"]
-
-            # ヒゲ率 = ヒゲ合計 / (ヒゲ+実体) の平均
-            wick_ratio_series = total_wick / candle_range.replace(0, np.nan)
-            wick_ratio = float(wick_ratio_series.tail(40).mean())
-            detail["wick_ratio"] = round(wick_ratio, 3) if not np.isnan(wick_ratio) else 0
+            # ヒゲ率（ヒゲ合計 / (ヒゲ+実体) の平均）→ 小さいほど素直
+            detail["wick_ratio"] = round(wick_ratio, 3) if math.isfinite(wick_ratio) else 0
 
             # ヒゲ率が低い（0.2〜0.4）→ 素直な値動き
             if wick_ratio <= 0.3:
@@ -428,9 +465,6 @@ class ExpectedValueScreener:
             score += wick_pts
 
             # 急変頻度（前足比で3%以上変動した足の割合）→ 少ないほど良い
-            pct_change = df["close"].pct_change().abs()
-            spike_count = int((pct_change > 0.03).sum())
-            spike_ratio = spike_count / n if n > 0 else 0
             detail["spike_ratio"] = round(spike_ratio, 3)
 
             if spike_ratio <= 0.02:
@@ -451,8 +485,10 @@ class ExpectedValueScreener:
     # ──────────────────────────────
     # 4. 先物スコア
     # ──────────────────────────────
-    def _calc_futures_score(self, symbol: str) -> tuple[float, dict]:
-        """OI増減 + Funding Rate 極端さ"""
+    def _calc_futures_score(
+        self, symbol: str, fr_data: dict | None = None
+    ) -> tuple[float, dict]:
+        """OI増減 + Funding Rate 極端さ（fr_data: 一括取得済みの Funding Rate）"""
         score = 0.0
         detail = {}
 
@@ -476,7 +512,8 @@ class ExpectedValueScreener:
             score += oi_pts
 
             # Funding Rate
-            fr_data = self.client.fetch_funding_rate(symbol)
+            if fr_data is None:
+                fr_data = self.client.fetch_funding_rate(symbol)
             fr = fr_data.get("funding_rate", 0) or 0
             detail["funding_rate"] = round(fr * 100, 4)  # パーセント表示
 
@@ -1,11 +1,11 @@
 """
 取引手法考案モジュール - AIによるエントリー/TP/SL提案 + ダブルチェック
 """
-import json
 from ai.llm_client import LLMClient
 from ai.prompts import SYSTEM_PROMPT, STRATEGY_PROPOSAL_PROMPT, SECOND_OPINION_PROMPT
 from config.trading_params import RISK_PARAMS
 from config.settings import is_configured
+from utils import jsonlib
 
 
 class Strategist:
@@ -15,12 +15,13 @@ class Strategist:
         self.llm = llm_client or LLMClient()
         self.risk = risk_params or RISK_PARAMS.copy()
 
-    def generate_proposal(self, analysis_result: dict) -> dict:
+    def generate_proposal(self, analysis_result: dict, cache_ttl_sec: float = 0) -> dict:
         """
         分析結果からAIが取引戦略を提案する
 
         Args:
             analysis_result: Analyzer.get_ai_analysis() の返り値
+            cache_ttl_sec: 同一プロンプトの応答を再利用する秒数（0 で毎回問い合わせ）
 
         Returns:
             取引提案のdict
@@ -36,13 +37,15 @@ class Strategist:
         prompt = STRATEGY_PROPOSAL_PROMPT.format(
             symbol=symbol,
             current_price=current_price,
-            analysis_result=json.dumps(ai_analysis, indent=2, ensure_ascii=False, default=str),
+            analysis_result=jsonlib.dumps_compact(ai_analysis),
             max_loss_pct=self.risk.get("max_loss_per_trade_pct", 2.0),
             min_rr_ratio=self.risk.get("min_risk_reward_ratio", 2.0),
             candle_data=candle_summary,
         )
 
-        proposal = self.llm.query_json(prompt, SYSTEM_PROMPT, provider="openai")
+        proposal = self.llm.query_json(
+            prompt, SYSTEM_PROMPT, provider="openai", cache_ttl_sec=cache_ttl_sec
+        )
 
         # バリデーション
         proposal = self._validate_proposal(proposal, current_price)
@@ -54,9 +57,12 @@ class Strategist:
             "provider": "openai",
         }
 
-    def get_second_opinion(self, proposal: dict, analysis_result: dict) -> dict:
+    def get_second_opinion(
+        self, proposal: dict, analysis_result: dict, cache_ttl_sec: float = 0
+    ) -> dict:
         """
         ダブルチェック - Claude でセカンドオピニオンを取得
+        （cache_ttl_sec > 0 で同一プロンプトの応答を再利用）
 
         Returns:
             セカンドオピニオンのdict
@@ -66,11 +72,13 @@ class Strategist:
 
         indicators = analysis_result.get("indicators", {})
         prompt = SECOND_OPINION_PROMPT.format(
-            original_analysis=json.dumps(proposal, indent=2, ensure_ascii=False, default=str),
-            technical_data=json.dumps(indicators, indent=2, ensure_ascii=False, default=str),
+            original_analysis=jsonlib.dumps_compact(proposal),
+            technical_data=jsonlib.dumps_compact(indicators),
         )
 
-        return self.llm.query_json(prompt, SYSTEM_PROMPT, provider="anthropic")
+        return self.llm.query_json(
+            prompt, SYSTEM_PROMPT, provider="anthropic", cache_ttl_sec=cache_ttl_sec
+        )
 
     def generate_full_strategy(self, analysis_result: dict) -> dict:
         """
@@ -117,11 +125,13 @@ class Strategist:
 
     def _format_candle_summary(self, indicators: dict) -> str:
         """テクニカル指標データからローソク足サマリーを作成"""
-        parts = []
-        for key, val in indicators.items():
-            if key not in ("error",):
-                parts.append(f"- {key}: {json.dumps(val, ensure_ascii=False, default=str)}")
-        return "\n".join(parts) if parts else "（データなし）"
+        # 中間リストを作らずジェネレータから1回の join で組み立てる（空なら空文字列）
+        summary = "\n".join(
+            f"- {key}: {jsonlib.dumps_compact(val)}"
+            for key, val in indicators.items()
+            if key != "error"
+        )
+        return summary or "（データなし）"
 
     def _make_final_decision(self, main_proposal: dict, second_opinion: dict) -> dict:
         """メイン提案とセカンドオピニオンから最終判定"""
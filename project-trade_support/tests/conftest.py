@@ -0,0 +1,7 @@
+"""
+pytest 共通設定 - プロジェクトルートを import パスに追加
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,115 @@
+"""
+テクニカル指標（modules.indicators）のテスト
+
+参照値は ta 0.11.0（EMAIndicator / MACD / RSIIndicator / AverageTrueRange /
+ADXIndicator / BollingerBands）で下記の系列から一度だけ算出して固定したもの
+"""
+import math
+
+import numpy as np
+import pytest
+
+from modules import indicators as ind
+
+
+def _series(n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    i = np.arange(n, dtype=np.float64)
+    close = 100 + 8 * np.sin(i / 7) + 3 * np.cos(i / 3.1) + 0.05 * i
+    high = close + 1.5 + np.abs(np.sin(i / 2.3))
+    low = close - 1.2 - np.abs(np.cos(i / 1.7))
+    return high, low, close
+
+
+# 足数 → ta による最新値
+TA_REFERENCE = {
+    28: {
+        "ema9": 99.64721973678184, "ema21": 102.45192299051385,
+        "rsi": 11.520722930177996, "atr": 4.026010111741309, "adx": 49.810045585985314,
+        "macd": (-2.073951216564282, math.nan, math.nan),
+        "bb": (112.67723955168265, 104.13231706359004, 95.58739457549743, 16.411663024600745),
+    },
+    60: {
+        "ema9": 110.86228291360764, "ema21": 107.16902858555189,
+        "rsi": 82.49117938428483, "atr": 3.9552993869246618, "adx": 50.873543225763335,
+        "macd": (3.5335312581608918, 2.7724471589244595, 0.7610840992364323),
+        "bb": (115.64153914655618, 106.48522756943461, 97.32891599231304, 17.197336731334154),
+    },
+    80: {
+        "ema9": 98.69215529248288, "ema21": 100.45287621090095,
+        "rsi": 39.87591423140555, "atr": 3.969122977875029, "adx": 36.93229861514026,
+        "macd": (-1.8393518433016567, -1.788352454633168, -0.05099938866848874),
+        "bb": (110.39107219907386, 100.86808550810483, 91.34509881713579, 18.8820609472237),
+    },
+    200: {
+        "ema9": 113.49982356512453, "ema21": 113.33453835591739,
+        "rsi": 34.89286947812944, "atr": 4.022745968690779, "adx": 39.7533345104539,
+        "macd": (0.8974133146761574, 1.9076093542181065, -1.0101960395419491),
+        "bb": (118.77484358752734, 114.66227656026385, 110.54970953300035, 7.173356662078874),
+    },
+    500: {
+        "ema9": 129.74951523762124, "ema21": 127.88540009924428,
+        "rsi": 62.63538038224919, "atr": 3.9634721398123185, "adx": 38.07150006122745,
+        "macd": (2.2169568921760856, 2.4817370806585664, -0.26478018848248075),
+        "bb": (136.71449867866423, 128.45356860736794, 120.19263853607167, 12.862126231069057),
+    },
+}
+
+
+def _approx(expected):
+    return pytest.approx(expected, rel=1e-9, abs=1e-9, nan_ok=True)
+
+
+@pytest.mark.parametrize("n", sorted(TA_REFERENCE))
+def test_matches_ta_reference(n):
+    high, low, close = _series(n)
+    ref = TA_REFERENCE[n]
+
+    assert ind.ema(close, 9) == _approx(ref["ema9"])
+    assert ind.ema(close, 21) == _approx(ref["ema21"])
+    assert ind.rsi(close, 14) == _approx(ref["rsi"])
+    assert ind.atr(high, low, close, 14) == _approx(ref["atr"])
+    assert ind.adx(high, low, close, 14) == _approx(ref["adx"])
+    assert ind.macd(close, 12, 26, 9) == _approx(ref["macd"])
+    assert ind.bollinger(close, 20, 2.0) == _approx(ref["bb"])
+
+
+def test_too_few_bars_return_nan():
+    high, low, close = _series(13)
+
+    assert math.isnan(ind.ema(close, 21))
+    assert math.isnan(ind.rsi(close, 14))
+    assert math.isnan(ind.atr(high, low, close, 14))
+    assert math.isnan(ind.tail_mean(close, 20))
+    assert all(math.isnan(v) for v in ind.macd(close, 12, 26, 9))
+    assert all(math.isnan(v) for v in ind.bollinger(close, 20, 2.0))
+
+    # ADX は平滑化を2回重ねるため 2×期間 の足が必要
+    high, low, close = _series(27)
+    assert math.isnan(ind.adx(high, low, close, 14))
+
+
+def test_flat_series():
+    close = np.full(100, 50.0)
+
+    assert ind.rsi(close, 14) == 100.0
+    assert ind.adx(close, close, close, 14) == 0.0
+    assert ind.atr(close, close, close, 14) == 0.0
+    assert ind.ema(close, 21) == pytest.approx(50.0)
+
+
+def test_macd_weights_are_reused_per_length():
+    # 異なる足数を交互に計算しても、足数ごとの重みがキャッシュから正しく使われる
+    ind._macd_weights.cache_clear()
+    for n in (60, 80, 60, 80):
+        _, _, close = _series(n)
+        assert ind.macd(close, 12, 26, 9) == _approx(TA_REFERENCE[n]["macd"])
+
+    info = ind._macd_weights.cache_info()
+    assert info.misses == 2
+    assert info.hits == 2
+
+    # キャッシュ共有の重みは書き換えられない
+    macd_weights, signal_weights = ind._macd_weights(60, 12, 26, 9)
+    assert not macd_weights.flags.writeable
+    assert not signal_weights.flags.writeable
+    assert not ind._ewm_weights(60, 2 / 10).flags.writeable
@@ -0,0 +1,110 @@
+"""
+LLMクライアント（レート制限判定・フォールバック）のテスト
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+from ai import llm_client
+from ai.llm_client import CIRCUIT_COOLDOWN_SEC, CIRCUIT_MAX_COOLDOWN_SEC, _rate_limit_cooldown
+
+
+class _FakeApiError(Exception):
+    def __init__(self, response=None, status_code=None, code=None):
+        super().__init__("rate limited")
+        self.response = response
+        self.status_code = status_code
+        self.code = code
+
+
+def test_rate_limit_cooldown_without_response_headers():
+    # google.api_core の ResourceExhausted は gRPC の call オブジェクトを response に持つ
+    error = _FakeApiError(response=object(), code=429)
+    assert _rate_limit_cooldown(error) == CIRCUIT_COOLDOWN_SEC
+
+
+def test_rate_limit_cooldown_uses_retry_after_header():
+    response = SimpleNamespace(headers={"retry-after": "12"})
+    assert _rate_limit_cooldown(_FakeApiError(response=response, status_code=429)) == 12.0
+
+    response = SimpleNamespace(headers={"retry-after": "9999"})
+    assert _rate_limit_cooldown(_FakeApiError(response=response, status_code=429)) == CIRCUIT_MAX_COOLDOWN_SEC
+
+
+def test_rate_limit_cooldown_ignores_other_errors():
+    assert _rate_limit_cooldown(_FakeApiError(status_code=500)) is None
+    assert _rate_limit_cooldown(ValueError("boom")) is None
+
+
+def test_query_google_returns_empty_on_grpc_rate_limit():
+    client = llm_client.LLMClient()
+
+    def generate_content(*args, **kwargs):
+        raise _FakeApiError(response=object(), code=429)
+
+    client._google_model = SimpleNamespace(generate_content=generate_content)
+    assert client.query_google("prompt") == ""
+    assert not client._breakers["google"].allow()
+
+
+def test_query_falls_back_sequentially_and_stops_at_first_answer():
+    client = llm_client.LLMClient()
+    started = []
+
+    def provider(name, answer, delay=0.0):
+        def call(prompt, system_prompt="", json_mode=False):
+            started.append(name)
+            time.sleep(delay)
+            # 先に始まった問い合わせが終わる前に次のプロバイダが呼ばれていないこと
+            assert started[-1] == name
+            return answer
+        return call
+
+    client._providers = {
+        "openai": provider("openai", ""),
+        "anthropic": provider("anthropic", "slow answer", delay=0.2),
+        "google": provider("google", "never used"),
+    }
+
+    assert client.query("prompt", provider="openai") == "slow answer"
+    assert started == ["openai", "anthropic"]
+
+
+def test_query_returns_message_when_all_providers_fail():
+    client = llm_client.LLMClient()
+    client._providers = {name: (lambda *a, **k: "") for name in ("openai", "anthropic", "google")}
+    assert client.query("prompt", provider="google")
+
+
+def test_circuit_breaker_counts_concurrent_failures():
+    breaker = llm_client.CircuitBreaker(threshold=1000)
+    threads = [
+        threading.Thread(target=lambda: [breaker.record_failure() for _ in range(500)])
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert breaker._failures == 4000
+    assert not breaker.allow()
+
+
+def test_query_json_does_not_cache_by_default():
+    client = llm_client.LLMClient()
+    calls = []
+
+    def provider(prompt, system_prompt="", json_mode=False):
+        calls.append(prompt)
+        return '{"judgment": "bullish"}'
+
+    client._providers = {"openai": provider}
+    prompt = "test_query_json_does_not_cache_by_default"
+    assert client.query_json(prompt) == {"judgment": "bullish"}
+    assert client.query_json(prompt) == {"judgment": "bullish"}
+    assert len(calls) == 2
+
+    # 明示した場合だけ再利用する
+    client.query_json(prompt, cache_ttl_sec=60)
+    client.query_json(prompt, cache_ttl_sec=60)
+    assert len(calls) == 3
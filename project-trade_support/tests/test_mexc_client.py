@@ -0,0 +1,52 @@
+"""
+MEXCClient の短期キャッシュのテスト（ネットワークには接続しない）
+"""
+import threading
+import time
+
+import pytest
+
+ccxt = pytest.importorskip("ccxt")
+
+from cachetools import TLRUCache
+
+from exchange.mexc_client import MARKET_CACHE_MAXSIZE, MEXCClient
+
+
+class _FakeExchange:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_order_book(self, symbol, limit):
+        self.calls += 1
+        return {
+            "symbol": symbol,
+            "bids": [[100.0, 1.0], [99.5, 2.0]],
+            "asks": [[100.5, 1.5], [101.0, 3.0]],
+        }
+
+
+def _client() -> MEXCClient:
+    # 取引所への接続は不要なので、キャッシュだけを持つインスタンスを作る
+    client = MEXCClient.__new__(MEXCClient)
+    client.exchange = _FakeExchange()
+    client._market_cache = TLRUCache(
+        maxsize=MARKET_CACHE_MAXSIZE, ttu=MEXCClient._market_expires_at, timer=time.time
+    )
+    client._cache_lock = threading.Lock()
+    return client
+
+
+def test_fetch_order_book_mutation_does_not_leak_into_cache():
+    client = _client()
+
+    ob = client.fetch_order_book("BTC/USDT:USDT", 20)
+    ob["bids"].pop(0)
+    ob["asks"][0][1] = 0.0
+    ob["symbol"] = "changed"
+
+    again = client.fetch_order_book("BTC/USDT:USDT", 20)
+    assert client.exchange.calls == 1
+    assert again["symbol"] == "BTC/USDT:USDT"
+    assert again["bids"] == [[100.0, 1.0], [99.5, 2.0]]
+    assert again["asks"] == [[100.5, 1.5], [101.0, 3.0]]
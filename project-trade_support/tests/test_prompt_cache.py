@@ -0,0 +1,128 @@
+"""
+プロンプト応答キャッシュ（同時呼び出しの集約・登録条件・値の独立性）のテスト
+"""
+import threading
+
+import pytest
+
+from ai.prompt_cache import PromptCache
+
+
+class _WatchedInflight(dict):
+    """進行中の計算を待ち合わせ側が取得したことを通知する _inflight"""
+
+    def __init__(self):
+        super().__init__()
+        self.joined = threading.Event()
+
+    def get(self, key, default=None):
+        future = super().get(key, default)
+        if future is not None:
+            self.joined.set()
+        return future
+
+
+def _watched_cache() -> PromptCache:
+    cache = PromptCache()
+    cache._inflight = _WatchedInflight()
+    return cache
+
+
+def test_concurrent_callers_share_one_compute():
+    cache = _watched_cache()
+    key = cache.make_key("openai", "system", "prompt")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"judgment": "bullish"}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_compute(key, compute, 60)))
+    leader.start()
+    assert started.wait(5)
+
+    # 先行の計算中に来た呼び出しは compute せずに結果を待つ
+    follower = threading.Thread(target=lambda: results.append(cache.get_or_compute(key, compute, 60)))
+    follower.start()
+    assert cache._inflight.joined.wait(5)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert results == [{"judgment": "bullish"}, {"judgment": "bullish"}]
+
+
+def test_leader_exception_reaches_waiters_and_clears_inflight():
+    cache = _watched_cache()
+    key = cache.make_key("openai", "system", "prompt")
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing_compute():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("api down")
+
+    errors = []
+
+    def call(compute):
+        try:
+            cache.get_or_compute(key, compute, 60)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call, args=(failing_compute,))
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=call, args=(lambda: pytest.fail("follower must not compute"),))
+    follower.start()
+    # 待ち合わせ側が Future を取得するまで先行の計算を終わらせない
+    assert cache._inflight.joined.wait(5)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert errors == ["api down", "api down"]
+    assert key not in cache._inflight
+    # 失敗は記録されず、次の呼び出しで計算し直す
+    assert cache.get_or_compute(key, lambda: {"ok": True}, 60) == {"ok": True}
+
+
+def test_uncacheable_result_is_not_stored():
+    cache = PromptCache()
+    key = cache.make_key("openai", "system", "prompt")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"raw_response": "not json"}
+
+    def cacheable(value):
+        return "raw_response" not in value
+
+    cache.get_or_compute(key, compute, 60, cacheable=cacheable)
+    cache.get_or_compute(key, compute, 60, cacheable=cacheable)
+
+    assert len(calls) == 2
+    assert cache.get(key) is None
+
+
+def test_returned_values_do_not_alias_cached_copy():
+    cache = PromptCache()
+    key = cache.make_key("openai", "system", "prompt")
+
+    first = cache.get_or_compute(key, lambda: {"signals": [{"indicator": "RSI"}]}, 60)
+    first["signals"].append({"indicator": "MACD"})
+    first["judgment"] = "bearish"
+
+    second = cache.get_or_compute(key, lambda: pytest.fail("must be served from cache"), 60)
+    assert second == {"signals": [{"indicator": "RSI"}]}
+
+    second["signals"].clear()
+    assert cache.get(key) == {"signals": [{"indicator": "RSI"}]}
@@ -0,0 +1,59 @@
+"""
+提案ログ（NaN を含む指標値）の保存・読み込みテスト
+"""
+import json
+import math
+
+import pytest
+
+from utils import jsonlib
+
+
+def test_loads_accepts_nan_written_by_stdlib_json():
+    data = jsonlib.loads(b'[{"ema_200": NaN, "rsi": 55.0}]')
+    assert math.isnan(data[0]["ema_200"])
+    assert data[0]["rsi"] == 55.0
+
+
+def test_loads_still_raises_on_broken_json():
+    with pytest.raises(jsonlib.JSONDecodeError):
+        jsonlib.loads(b'[{"symbol": ')
+
+
+def test_nan_proposal_is_kept_when_appending(tmp_path):
+    pytest.importorskip("ccxt")
+    from modules.monitor import MarketMonitor
+
+    # 取引所・LLMクライアントは不要なので、ログ保存先だけを持つインスタンスを作る
+    monitor = MarketMonitor.__new__(MarketMonitor)
+    monitor.log_dir = tmp_path
+
+    monitor._save_proposals_to_log([{
+        "timestamp": "2024-02-13T15:00:00",
+        "symbol": "BTC/USDT:USDT",
+        "indicators": {"ema_200": float("nan"), "macd_signal": float("nan")},
+    }])
+    monitor._save_proposals_to_log([{
+        "timestamp": "2024-02-13T15:15:00",
+        "symbol": "ETH/USDT:USDT",
+        "indicators": {"ema_200": 3000.0},
+    }])
+
+    logs = monitor.get_latest_logs(10)
+    assert [log["symbol"] for log in logs] == ["ETH/USDT:USDT", "BTC/USDT:USDT"]
+    assert math.isnan(logs[1]["indicators"]["ema_200"])
+
+
+def test_read_proposal_logs_merges_reviewed_files_newest_first(tmp_path):
+    pytest.importorskip("ccxt")
+    from modules.monitor import read_proposal_logs
+
+    (tmp_path / "Reviewed_proposals_20240213_14.json").write_text(
+        json.dumps([{"symbol": "A"}, {"symbol": "B"}]), encoding="utf-8"
+    )
+    (tmp_path / "proposals_20240213_15.json").write_text(
+        json.dumps([{"symbol": "C"}]), encoding="utf-8"
+    )
+
+    assert [log["symbol"] for log in read_proposal_logs(tmp_path, 10)] == ["C", "B", "A"]
+    assert [log["symbol"] for log in read_proposal_logs(tmp_path, 2)] == ["C", "B"]
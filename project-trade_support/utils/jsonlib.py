@@ -0,0 +1,31 @@
+"""
+JSONユーティリティ - orjson が導入されていれば高速パーサを使い、無ければ標準 json にフォールバック
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson は任意依存
+    orjson = None
+
+# orjson.JSONDecodeError は json.JSONDecodeError のサブクラスなので、例外は共通で捕捉できる
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: bytes | str):
+    """bytes / str をパース（bytes のままの方が orjson ではデコード1回分速い）
+
+    orjson は標準 json が出力する NaN / Infinity を受け付けないため、
+    その場合は標準 json で読み直す（既存ログを読めずに上書きしないように）
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def dumps_compact(obj) -> str:
+    """プロンプト埋め込み用の空白なしJSON（インデント分の入力トークンを省く。日本語はそのまま）"""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)